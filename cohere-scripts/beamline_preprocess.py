@@ -20,6 +20,7 @@ __all__ = ['handle_prep',
 
 import argparse
 import importlib
+import re
 import cohere_core.utilities as ut
 import auto_data as ad
 from multiprocessing import Process
@@ -27,6 +28,10 @@ import common as com
 import multipeak as mp
 
 
+# scan unit in configured scan, a single scan or a range, ex: 54 or 54-60
+SCAN_RANGE_RE = re.compile(r'(\d+)(?:-(\d+))?')
+
+
 def handle_prep(experiment_dir, **kwargs):
     """
     Reads the configuration files and accrdingly creates prep_data.tif file in <experiment_dir>/prep directory or multiple
@@ -104,13 +109,13 @@ def handle_prep(experiment_dir, **kwargs):
     # Parse the scan into list of scan ranges, defined by starting scan, and ending scan, inclusive.
     # The single scan has range defined as the same starting and ending scan.
     scan_ranges = []
-    scan_units = [u for u in scan.replace(' ','').split(',')]
-    for u in scan_units:
-        if '-' in u:
-            r = u.split('-')
-            scan_ranges.append([int(r[0]), int(r[1])])
-        else:
-            scan_ranges.append([int(u), int(u)])
+    for scan_unit in scan.replace(' ', '').split(','):
+        match = SCAN_RANGE_RE.fullmatch(scan_unit)
+        if match is None:
+            print(f'scan {scan_unit} is not a scan or a scan range')
+            return f'scan {scan_unit} is not a scan or a scan range'
+        first, last = match.groups()
+        scan_ranges.append([int(first), int(last or first)])
 
     # get tuples of (scan, data info) for the scan ranges.
     # Note: For aps_34idc the data info is a directory path to the data.
@@ -407,7 +407,7 @@ def handle_visualization(experiment_dir, rec_id=None, **kwargs):
         separate = main_conf_map.get('separate_scans', False) or main_conf_map.get('separate_scan_ranges', False)
         # get parameters from config files
         conf_map = disp_conf_map
-        conf_map['binning'] = data_conf_map.get('binning', [1,1,1])
+        conf_map['binning'] = data_conf_map.get('binning', (1, 1, 1))
         conf_map['beamline'] = main_conf_map.get('beamline')
 
         if 'results_dir' in disp_conf_map:
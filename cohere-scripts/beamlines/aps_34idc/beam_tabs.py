@@ -1,8 +1,9 @@
 import os
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
-import ast
 import cohere_core.utilities as ut
+import common as com
+
 
 
 def msg_window(text):
@@ -35,14 +36,9 @@ def select_file(start_dir):
     str
         name of selected file or None
     """
-    start_dir = start_dir.replace(os.sep, '/')
-    dialog = QFileDialog(None, 'select dir', start_dir)
-    dialog.setFileMode(QFileDialog.ExistingFile)
-    dialog.setSidebarUrls([QUrl.fromLocalFile(start_dir)])
-    if dialog.exec_() == QDialog.Accepted:
-        return str(dialog.selectedFiles()[0]).replace(os.sep, '/')
-    else:
-        return None
+    # the native dialog lists the directory much faster than the Qt dialog
+    file_name, _ = QFileDialog.getOpenFileName(None, 'select file', com.norm_path(start_dir))
+    return com.norm_path(file_name) or None
 
 
 def select_dir(start_dir):
@@ -57,14 +53,10 @@ def select_dir(start_dir):
     str
         name of selected directory or None
     """
-    start_dir = start_dir.replace(os.sep, '/')
-    dialog = QFileDialog(None, 'select dir', start_dir)
-    dialog.setFileMode(QFileDialog.DirectoryOnly)
-    dialog.setSidebarUrls([QUrl.fromLocalFile(start_dir)])
-    if dialog.exec_() == QDialog.Accepted:
-        return str(dialog.selectedFiles()[0]).replace(os.sep, '/')
-    else:
-        return None
+    # the native dialog lists the directory much faster than the Qt dialog
+    dir_name = QFileDialog.getExistingDirectory(None, 'select dir', com.norm_path(start_dir),
+                                                QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks)
+    return com.norm_path(dir_name) or None
 
 
 def set_overriden(item):
@@ -211,7 +203,7 @@ class PrepTab(QWidget):
         """
         prep_file = select_file(os.getcwd())
         if prep_file is not None:
-            conf_map = ut.read_config(prep_file.replace(os.sep, '/'))
+            conf_map = ut.read_config(prep_file)
             self.load_tab(conf_map)
         else:
             msg_window('please select valid prep config file')
@@ -229,21 +221,27 @@ class PrepTab(QWidget):
             contains parameters read from window
         """
         conf_map = {}
-        if len(self.data_dir_button.text().strip()) > 0:
-            conf_map['data_dir'] = str(self.data_dir_button.text()).strip()
-        if len(self.dark_file_button.text().strip()) > 0:
-            conf_map['darkfield_filename'] = str(self.dark_file_button.text().strip())
-        if len(self.white_file_button.text().strip()) > 0:
-            conf_map['whitefield_filename'] = str(self.white_file_button.text().strip())
-        if len(self.Imult.text()) > 0:
-            conf_map['Imult'] = ast.literal_eval(str(self.Imult.text()).replace(os.linesep,''))
-        if len(self.min_files.text()) > 0:
-            min_files = ast.literal_eval(str(self.min_files.text()))
-            conf_map['min_files'] = min_files
-        if len(self.exclude_scans.text()) > 0:
-            conf_map['exclude_scans'] = ast.literal_eval(str(self.exclude_scans.text()).replace(os.linesep,''))
-        if len(self.roi.text()) > 0:
-            conf_map['roi'] = ast.literal_eval(str(self.roi.text()).replace(os.linesep,''))
+        text = self.data_dir_button.text().strip()
+        if text:
+            conf_map['data_dir'] = text
+        text = self.dark_file_button.text().strip()
+        if text:
+            conf_map['darkfield_filename'] = text
+        text = self.white_file_button.text().strip()
+        if text:
+            conf_map['whitefield_filename'] = text
+        text = self.Imult.text()
+        if text:
+            conf_map['Imult'] = com.parse_literal(text)
+        text = self.min_files.text()
+        if text:
+            conf_map['min_files'] = com.parse_literal(text)
+        text = self.exclude_scans.text()
+        if text:
+            conf_map['exclude_scans'] = com.parse_literal(text)
+        text = self.roi.text()
+        if text:
+            conf_map['roi'] = com.parse_literal(text)
 
         return conf_map
 
@@ -279,21 +277,22 @@ class PrepTab(QWidget):
         #     msg_window('cannot prepare data for 34idc, need data directory')
         #     return
 
-        main_config_map = ut.read_config(ut.join(self.main_win.experiment_dir, 'conf', 'config'))
-        auto_data = 'auto_data' in main_config_map and main_config_map['auto_data']
+        # auto data is set in main window, no need to read the main config
+        auto_data = self.main_win.auto_data.isChecked()
+        prep_file = ut.join(self.main_win.experiment_dir, 'conf', 'config_prep')
 
         if auto_data:
             # exclude outliers_scans from saving
-            current_prep_map = ut.read_config(ut.join(self.main_win.experiment_dir, 'conf', 'config_prep'))
+            current_prep_map = ut.read_config(prep_file)
             if current_prep_map is not None and 'outliers_scans' in current_prep_map:
                 conf_map['outliers_scans'] = current_prep_map['outliers_scans']
-        ut.write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', 'config_prep'))
+        ut.write_config(conf_map, prep_file)
 
         self.tabs.run_prep()
 
         # reload the window if auto_data as the outliers_scans could change
         if auto_data:
-            prep_map = ut.read_config(ut.join(self.main_win.experiment_dir, 'conf', 'config_prep'))
+            prep_map = ut.read_config(prep_file)
             self.load_tab(prep_map)
 
 
@@ -307,9 +306,8 @@ class PrepTab(QWidget):
         -------
         nothing
         """
-        darkfield_filename = select_file(os.getcwd().replace(os.sep, '/'))
+        darkfield_filename = select_file(os.getcwd())
         if darkfield_filename is not None:
-            darkfield_filename = darkfield_filename.replace(os.sep, '/')
             self.dark_file_button.setStyleSheet("Text-align:left")
             self.dark_file_button.setText(darkfield_filename)
         else:
@@ -326,9 +324,8 @@ class PrepTab(QWidget):
         -------
         nothing
         """
-        whitefield_filename = select_file(os.getcwd().replace(os.sep, '/'))
+        whitefield_filename = select_file(os.getcwd())
         if whitefield_filename is not None:
-            whitefield_filename = whitefield_filename.replace(os.sep, '/')
             self.white_file_button.setStyleSheet("Text-align:left")
             self.white_file_button.setText(whitefield_filename)
         else:
@@ -345,7 +342,7 @@ class PrepTab(QWidget):
         -------
         nothing
         """
-        data_dir = select_dir(os.getcwd().replace(os.sep, '/')).replace(os.sep, '/')
+        data_dir = select_dir(os.getcwd())
         if data_dir is not None:
             self.data_dir_button.setStyleSheet("Text-align:left")
             self.data_dir_button.setText(data_dir)
@@ -374,6 +371,10 @@ class PrepTab(QWidget):
 
 
 class DispTab(QWidget):
+    # parameters set with checkboxes and parameters parsed from text fields, the widget has the parameter name
+    check_params = ('make_twin', 'unwrap')
+    literal_params = ('crop', 'rampups')
+
     def __init__(self, parent=None):
         """
         Constructor, initializes the tabs.
@@ -440,36 +441,19 @@ class DispTab(QWidget):
         # Do not update results dir, as it may point to a wrong experiment if
         # it's loaded from another
 
-        if 'make_twin' in conf_map:
-            make_twin = conf_map['make_twin']
-            if make_twin:
-                self.make_twin.setChecked(True)
-            else:
-                self.make_twin.setChecked(False)
-        else:
-            self.make_twin.setChecked(False)
-
-        if 'unwrap' in conf_map:
-            unwrap = conf_map['unwrap']
-            if unwrap:
-                self.unwrap.setChecked(True)
-            else:
-                self.unwrap.setChecked(False)
-        else:
-            self.unwrap.setChecked(False)
-
-        if 'crop' in conf_map:
-            self.crop.setText(str(conf_map['crop']).replace(" ", ""))
-        if 'rampups' in conf_map:
-            self.rampups.setText(str(conf_map['rampups']).replace(" ", ""))
+        for param in self.check_params:
+            getattr(self, param).setChecked(bool(conf_map.get(param, False)))
+        for param in self.literal_params:
+            if param in conf_map:
+                getattr(self, param).setText(str(conf_map[param]).replace(" ", ""))
 
 
     def clear_conf(self):
         self.result_dir_button.setText('')
-        self.make_twin.setChecked(False)
-        self.unwrap.setChecked(False)
-        self.crop.setText('')
-        self.rampups.setText('')
+        for param in self.check_params:
+            getattr(self, param).setChecked(False)
+        for param in self.literal_params:
+            getattr(self, param).setText('')
 
 
     def load_disp_conf(self):
@@ -485,7 +469,7 @@ class DispTab(QWidget):
         """
         disp_file = select_file(os.getcwd())
         if disp_file is not None:
-            conf_map = ut.read_config(disp_file.replace(os.sep, '/'))
+            conf_map = ut.read_config(disp_file)
             self.load_tab(conf_map)
         else:
             msg_window('please select valid disp config file')
@@ -503,16 +487,16 @@ class DispTab(QWidget):
             contains parameters read from window
         """
         conf_map = {}
-        if len(self.result_dir_button.text()) > 0:
-            conf_map['results_dir'] = str(self.result_dir_button.text()).replace(os.sep, '/')
-        if self.make_twin.isChecked():
-            conf_map['make_twin'] = True
-        if self.unwrap.isChecked():
-            conf_map['unwrap'] = True
-        if len(self.crop.text()) > 0:
-            conf_map['crop'] = ast.literal_eval(str(self.crop.text()).replace(os.linesep, ''))
-        if len(self.rampups.text()) > 0:
-            conf_map['rampups'] = ast.literal_eval(str(self.rampups.text()).replace(os.linesep, ''))
+        text = self.result_dir_button.text()
+        if text:
+            conf_map['results_dir'] = com.norm_path(text)
+        for param in self.check_params:
+            if getattr(self, param).isChecked():
+                conf_map[param] = True
+        for param in self.literal_params:
+            text = getattr(self, param).text()
+            if text:
+                conf_map[param] = com.parse_literal(text)
 
         return conf_map
 
@@ -537,7 +521,7 @@ class DispTab(QWidget):
             msg_window('the results directory is not set')
             return
 
-        results_dir = str(self.result_dir_button.text()).replace(os.sep, '/')
+        results_dir = com.norm_path(str(self.result_dir_button.text()))
 
         # found_file = False
         # for p, d, f in os.walk(results_dir):
@@ -630,12 +614,17 @@ class DispTab(QWidget):
         results_dir = select_dir(os.getcwd())
         if results_dir is not None:
             self.result_dir_button.setStyleSheet("Text-align:left")
-            self.result_dir_button.setText(results_dir.replace(os.sep, '/'))
+            self.result_dir_button.setText(results_dir)
         else:
             msg_window('please select valid results directory')
 
 
 class SubInstrTab():
+    # parameters read from spec file or configured, the widget has the parameter name
+    params = ('energy', 'delta', 'gamma', 'detdist', 'th', 'chi', 'phi', 'scanmot', 'scanmot_del', 'detector')
+    # parameters kept as text, the other are parsed
+    text_params = ('scanmot', 'detector')
+
     def init(self, instr_tab, main_window):
         """
         Creates and initializes the 'Instrument' tab.
@@ -699,49 +688,16 @@ class SubInstrTab():
         self.parse_spec()
 
         # if parameters are configured, override the readings from spec file
-        if 'energy' in conf_map:
-            self.energy.setText(str(conf_map['energy']).replace(" ", ""))
-            self.energy.setStyleSheet('color: black')
-        if 'delta' in conf_map:
-            self.delta.setText(str(conf_map['delta']).replace(" ", ""))
-            self.delta.setStyleSheet('color: black')
-        if 'gamma' in conf_map:
-            self.gamma.setText(str(conf_map['gamma']).replace(" ", ""))
-            self.gamma.setStyleSheet('color: black')
-        if 'detdist' in conf_map:
-            self.detdist.setText(str(conf_map['detdist']).replace(" ", ""))
-            self.detdist.setStyleSheet('color: black')
-        if 'th' in conf_map:
-            self.th.setText(str(conf_map['th']).replace(" ", ""))
-            self.th.setStyleSheet('color: black')
-        if 'chi' in conf_map:
-            self.chi.setText(str(conf_map['chi']).replace(" ", ""))
-            self.chi.setStyleSheet('color: black')
-        if 'phi' in conf_map:
-            self.phi.setText(str(conf_map['phi']).replace(" ", ""))
-            self.phi.setStyleSheet('color: black')
-        if 'scanmot' in conf_map:
-            self.scanmot.setText(str(conf_map['scanmot']).replace(" ", ""))
-            self.scanmot.setStyleSheet('color: black')
-        if 'scanmot_del' in conf_map:
-            self.scanmot_del.setText(str(conf_map['scanmot_del']).replace(" ", ""))
-            self.scanmot_del.setStyleSheet('color: black')
-        if 'detector' in conf_map:
-            self.detector.setText(str(conf_map['detector']).replace(" ", ""))
-            self.detector.setStyleSheet('color: black')
+        for param in self.params:
+            if param in conf_map:
+                widget = getattr(self, param)
+                widget.setText(str(conf_map[param]).replace(" ", ""))
+                widget.setStyleSheet('color: black')
 
 
     def clear_conf(self):
-        self.energy.setText('')
-        self.delta.setText('')
-        self.gamma.setText('')
-        self.detdist.setText('')
-        self.th.setText('')
-        self.chi.setText('')
-        self.phi.setText('')
-        self.scanmot.setText('')
-        self.scanmot_del.setText('')
-        self.detector.setText('')
+        for param in self.params:
+            getattr(self, param).setText('')
 
 
     def get_instr_config(self):
@@ -756,26 +712,10 @@ class SubInstrTab():
             contains parameters read from window
         """
         conf_map = {}
-        if len(self.energy.text()) > 0:
-            conf_map['energy'] = ast.literal_eval(str(self.energy.text()))
-        if len(self.delta.text()) > 0:
-            conf_map['delta'] = ast.literal_eval(str(self.delta.text()))
-        if len(self.gamma.text()) > 0:
-            conf_map['gamma'] = ast.literal_eval(str(self.gamma.text()))
-        if len(self.detdist.text()) > 0:
-            conf_map['detdist'] = ast.literal_eval(str(self.detdist.text()))
-        if len(self.th.text()) > 0:
-            conf_map['th'] = ast.literal_eval(str(self.th.text()))
-        if len(self.chi.text()) > 0:
-            conf_map['chi'] = ast.literal_eval(str(self.chi.text()))
-        if len(self.phi.text()) > 0:
-            conf_map['phi'] = ast.literal_eval(str(self.phi.text()))
-        if len(self.scanmot.text()) > 0:
-            conf_map['scanmot'] = str(self.scanmot.text())
-        if len(self.scanmot_del.text()) > 0:
-            conf_map['scanmot_del'] = ast.literal_eval(str(self.scanmot_del.text()))
-        if len(self.detector.text()) > 0:
-            conf_map['detector'] = str(self.detector.text())
+        for param in self.params:
+            text = getattr(self, param).text()
+            if text:
+                conf_map[param] = text if param in self.text_params else com.parse_literal(text)
 
         return conf_map
 
@@ -820,36 +760,11 @@ class SubInstrTab():
         spec_dict = diff_obj.parse_spec(specfile, last_scan)
         if spec_dict is None:
             return
-        if 'energy' in spec_dict:
-            self.energy.setText(str(spec_dict['energy']))
-            self.energy.setStyleSheet('color: blue')
-        if 'delta' in spec_dict:
-            self.delta.setText(str(spec_dict['delta']))
-            self.delta.setStyleSheet('color: blue')
-        if 'gamma' in spec_dict:
-            self.gamma.setText(str(spec_dict['gamma']))
-            self.gamma.setStyleSheet('color: blue')
-        if 'th' in spec_dict:
-            self.th.setText(str(spec_dict['th']))
-            self.th.setStyleSheet('color: blue')
-        if 'chi' in spec_dict:
-            self.chi.setText(str(spec_dict['chi']))
-            self.chi.setStyleSheet('color: blue')
-        if 'phi' in spec_dict:
-            self.phi.setText(str(spec_dict['phi']))
-            self.phi.setStyleSheet('color: blue')
-        if 'detdist' in spec_dict:
-            self.detdist.setText(str(spec_dict['detdist']))
-            self.detdist.setStyleSheet('color: blue')
-        if 'scanmot' in spec_dict:
-            self.scanmot.setText(str(spec_dict['scanmot']))
-            self.scanmot.setStyleSheet('color: blue')
-        if 'scanmot_del' in spec_dict:
-            self.scanmot_del.setText(str(spec_dict['scanmot_del']))
-            self.scanmot_del.setStyleSheet('color: blue')
-        if 'detector' in spec_dict:
-            self.detector.setText(str(spec_dict['detector']))
-            self.detector.setStyleSheet('color: blue')
+        for param in self.params:
+            if param in spec_dict:
+                widget = getattr(self, param)
+                widget.setText(str(spec_dict[param]))
+                widget.setStyleSheet('color: blue')
 
 
 
@@ -996,7 +911,7 @@ class InstrTab(QWidget):
         """
         instr_file = select_file(os.getcwd())
         if instr_file is not None:
-            conf_map = ut.read_config(instr_file.replace(os.sep, '/'))
+            conf_map = ut.read_config(instr_file)
             self.load_tab(conf_map)
         else:
             msg_window('please select valid instrument config file')
@@ -1014,10 +929,12 @@ class InstrTab(QWidget):
             contains parameters read from window
         """
         conf_map = {}
-        if len(self.diffractometer.text()) > 0:
-            conf_map['diffractometer'] = str(self.diffractometer.text())
-        if len(self.spec_file_button.text()) > 0:
-            conf_map['specfile'] = str(self.spec_file_button.text())
+        text = self.diffractometer.text()
+        if text:
+            conf_map['diffractometer'] = text
+        text = self.spec_file_button.text()
+        if text:
+            conf_map['specfile'] = text
 
         if self.add_config:
             conf_map.update(self.extended.get_instr_config())
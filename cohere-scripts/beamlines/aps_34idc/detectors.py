@@ -5,6 +5,10 @@ import glob
 import cohere_core.utilities as ut
 from abc import ABC, abstractmethod
 
+# for aps_34idc the file names end with the slice number, followed by 'tif' or 'tiff' extension
+FILE_NAME_RE = re.compile(r'(\d+)\.tiff?$')
+TRAILING_DIGITS_RE = re.compile(r'\d+$')
+
 
 class Detector(ABC):
     """
@@ -39,7 +43,7 @@ class Detector(ABC):
         for scandir in sorted(os.listdir(self.data_dir)):
             scandir_full = ut.join(self.data_dir, scandir)
             if os.path.isdir(scandir_full):
-                last_digits = re.search(r'\d+$', scandir_full)
+                last_digits = TRAILING_DIGITS_RE.search(scandir_full)
                 if last_digits is not None:
                     scan = int(last_digits.group())
                 if scan < scan_range[0]:
@@ -78,16 +82,11 @@ class Detector(ABC):
             3D array containing corrected data for one scan.
         """
         slices_files = {}
-        for file_name in os.listdir(dir):
-            if file_name.endswith('tif'):
-                fnbase = file_name[:-4]
-            else:
-                continue
-            # for aps_34idc the file names end with the slice number, followed by 'tif' extension
-            last_digits = re.search(r'\d+$', fnbase)
-            if last_digits is not None:
-                key = int(last_digits.group())
-                slices_files[key] = ut.join(dir, file_name)
+        with os.scandir(dir) as entries:
+            for entry in entries:
+                fn_match = FILE_NAME_RE.search(entry.name)
+                if fn_match is not None and entry.is_file():
+                    slices_files[int(fn_match.group(1))] = entry.path
 
         ordered_keys = sorted(list(slices_files.keys()))
         ordered_slices = [self.get_frame(slices_files[k]) for k in ordered_keys]
@@ -100,6 +99,16 @@ class Detector(ABC):
         except:
             print("problem reading raw file ", filename)
             raise
+        return self.raw_frame
+
+    def set_roi_slices(self):
+        """
+        Computes the detector area slices from roi. The slices are used to cut the correction frames
+        to the size of data frame.
+        roi is start,size,start,size
+        """
+        self.roislice1 = slice(self.roi[0], self.roi[0] + self.roi[1])
+        self.roislice2 = slice(self.roi[2], self.roi[2] + self.roi[3])
 
     @abstractmethod
     def get_frame(self, filename):
@@ -157,6 +166,10 @@ class Detector_34idcTIM1(Detector):
         # this will capture things like data directory, darkfield_filename, etc.
         for key, val in kwargs.items():
             setattr(self, key, val)
+        self.set_roi_slices()
+        # bad pixels mask in roi, set when darkfield is loaded
+        self.dark_mask = None
+        self.has_bad = False
 
     def load_darkfield(self):
         """
@@ -170,6 +183,8 @@ class Detector_34idcTIM1(Detector):
         """
         try:
             self.darkfield = ut.read_tif(self.darkfield_filename)
+            self.dark_mask = self.darkfield[self.roislice1, self.roislice2] > 1
+            self.has_bad = bool(self.dark_mask.any())
         except:
             print("Darkfield filename not set for TIM1, will not correct")
 
@@ -192,16 +207,12 @@ class Detector_34idcTIM1(Detector):
             else:
                 print("Darkfield filename not configured for TIM1, will not correct")
 
-        roislice1 = slice(self.roi[0], self.roi[0] + self.roi[1])
-        roislice2 = slice(self.roi[2], self.roi[2] + self.roi[3])
-
         raw_frame = self.get_raw_frame(filename)
-        try:
-            frame = np.where(self.darkfield[roislice1, roislice2] > 1, 0.0, raw_frame)
-        except:
-            frame = raw_frame
+        # no correction if darkfield is not loaded or has no bad pixels in roi
+        if not self.has_bad:
+            return raw_frame
 
-        return frame
+        return np.where(self.dark_mask, 0.0, raw_frame)
 
 
 class Detector_34idcTIM2(Detector):
@@ -227,6 +238,12 @@ class Detector_34idcTIM2(Detector):
         # this will capture things like data directory, whitefield_filename, etc.
         for key, val in kwargs.items():
             setattr(self, key, val)
+        if self.roi is None:
+            self.roi = (0, 512, 0, 512)
+        self.set_roi_slices()
+        # the correction arrays in roi are calculated when reading the first frame
+        self.bad_mask = None
+        self.wf_roi_recip = None
 
     def load_whitefield(self):
         """
@@ -248,7 +265,7 @@ class Detector_34idcTIM2(Detector):
             0:255] = 0  # wierd pixels on edge of seam (TL/TR). Kill in WF kills in returned frame as well.
             self.wfavg = np.average(self.whitefield)
             self.wfstd = np.std(self.whitefield)
-            self.whitefield = np.where(self.whitefield < self.wfavg - 3 * self.wfstd, 0, self.whitefield)
+            self.whitefield[self.whitefield < self.wfavg - 3 * self.wfstd] = 0
         except:
             print("Corrections to the TIM2 whitefield image failed in detector module.")
 
@@ -268,7 +285,7 @@ class Detector_34idcTIM2(Detector):
             print("Darkfield filename not set for TIM2")
             raise
         if type(self.whitefield) == np.ndarray:
-            self.whitefield = np.where(self.darkfield > 1, 0, self.whitefield)  # kill known bad pixel
+            self.whitefield[self.darkfield > 1] = 0  # kill known bad pixel
 
     def get_frame(self, filename):
         """
@@ -299,24 +316,12 @@ class Detector_34idcTIM2(Detector):
         # divide whitefield
         # blank out pixels identified in darkfield
         # insert 4 cols 5 rows if roi crosses asic boundary
-        if self.roi is None:
-            self.roi = (0, 512, 0, 512)
-        # WFprocessing using darkfield.  So do it first.
-        if not type(self.darkfield) == np.ndarray:
-            self.load_darkfield()
-        if not type(self.whitefield) == np.ndarray:
-            self.load_whitefield()
-        if self.Imult is None:
-            self.Imult = self.wfavg
-
-        roislice1 = slice(self.roi[0], self.roi[0] + self.roi[1])
-        roislice2 = slice(self.roi[2], self.roi[2] + self.roi[3])
+        if self.wf_roi_recip is None:
+            self.set_correction()
 
         # some of this should probably be in try blocks
-        self.get_raw_frame(filename)
-        normframe = self.raw_frame / self.whitefield[roislice1, roislice2] * self.Imult
-        normframe = np.where(self.darkfield[roislice1, roislice2] > 1, 0.0, normframe)
-        normframe = np.where(np.isfinite(normframe), normframe, 0)
+        # the bad pixels are zeroed by the reciprocal whitefield
+        normframe = self.get_raw_frame(filename) * self.wf_roi_recip
 
         frame, seam_added = self.insert_seam(normframe)
         frame = np.where(np.isnan(frame), 0, frame)
@@ -325,6 +330,25 @@ class Detector_34idcTIM2(Detector):
             frame = self.clear_seam(frame)
         return frame
 
+    def set_correction(self):
+        """
+        Calculates the correction arrays in roi once, so the correction of each frame is reduced to
+        multiplication. The bad pixels, i.e. pixels killed in whitefield or marked in darkfield, are set to
+        zero in the reciprocal whitefield.
+        """
+        # WFprocessing using darkfield.  So do it first.
+        if not type(self.darkfield) == np.ndarray:
+            self.load_darkfield()
+        if not type(self.whitefield) == np.ndarray:
+            self.load_whitefield()
+        if self.Imult is None:
+            self.Imult = self.wfavg
+
+        wf_roi = self.whitefield[self.roislice1, self.roislice2]
+        self.bad_mask = (wf_roi == 0) | (self.darkfield[self.roislice1, self.roislice2] > 1)
+        self.wf_roi_recip = np.zeros(wf_roi.shape)
+        np.divide(self.Imult, wf_roi, out=self.wf_roi_recip, where=~self.bad_mask)
+
     # frame here can also be a 3D array.
     def insert_seam(self, arr):
         """
@@ -406,13 +430,15 @@ class Detector_34idcTIM2(Detector):
         return arr
 
 
+# maps detector name to detector class
+dets = {det_class.name: det_class for det_class in Detector.__subclasses__()}
+
+
 def create_detector(det_name, **kwargs):
-    if det_name == '34idcTIM1':
-        return Detector_34idcTIM1(**kwargs)
-    elif det_name == '34idcTIM2':
-        return Detector_34idcTIM2(**kwargs)
-    else:
+    det_class = dets.get(det_name)
+    if det_class is None:
         print(f'detector {det_name} not defined.')
         return None
+    return det_class(**kwargs)
 
 
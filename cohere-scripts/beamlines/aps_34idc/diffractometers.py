@@ -5,6 +5,7 @@ from xrayutilities.io import spec as spec
 import beamlines.aps_34idc.detectors as det
 from abc import ABC, abstractmethod
 
+TWO_PI = 2 * m.pi
 
 
 class Diffractometer(ABC):
@@ -42,11 +43,23 @@ class Diffractometer_34idc(Diffractometer):
     sampleaxes_mne = ('th', 'chi', 'phi')
     detectoraxes_name = ('Delta', 'Gamma')
     detectoraxes_mne = ('delta', 'gamma')
+    # order of axes in qc.area arguments
+    axes_mne = sampleaxes_mne + detectoraxes_mne
+    # motors that can be scanned
+    scanmots = frozenset(sampleaxes_mne + ('en',))
     detectordist_name = 'camdist'
     detectordist_mne = 'detdist'
+    # parameters that must be parsed or configured to calculate geometry, in addition to the axes
+    geometry_params = ('detdist', 'energy', 'scanmot', 'scanmot_del')
 
     def __init__(self):
         super(Diffractometer_34idc, self).__init__('34idc')
+        # geometry calculated for given parameters, reused by scans with the same parameters
+        self.geometry_cache = {}
+        # detector objects created when the detector is not passed, reused by other scans
+        self.det_objs = {}
+        # initialized QConversion objects reused by scans with the same setup
+        self.qc_cache = {}
 
     def parse_spec(self, specfile, scan):
         """
@@ -145,99 +158,91 @@ class Diffractometer_34idc(Diffractometer):
         """
         attrs = self.parse_spec(specfile, scan)
         attrs.update(kwargs)
-        binning = attrs.get('binning', [1, 1, 1])
+        missing = set(self.geometry_params + self.axes_mne) - attrs.keys()
+        if len(missing) > 0:
+            raise RuntimeError(f'parameters not parsed and not configured: {sorted(missing)}, cannot calculate geometry')
+        bx, by, bz = attrs.get('binning', (1, 1, 1))
 
         # set the attributes with values parsed from spec and then possibly overridden by configuration
         for attr in attrs:
             setattr(self, attr, attrs[attr])
 
         if det_obj is None:
-            det_obj = det.create_detector(self.detector)
-        px = det_obj.pixel[0] * binning[0]
-        py = det_obj.pixel[1] * binning[1]
+            if self.detector not in self.det_objs:
+                self.det_objs[self.detector] = det.create_detector(self.detector)
+            det_obj = self.det_objs[self.detector]
+        px = det_obj.pixel[0] * bx
+        py = det_obj.pixel[1] * by
 
         detdist = attrs.get('detdist') / 1000.0  # convert to meters
         scanmot = attrs.get('scanmot').strip()
-        enfix = 1
+        if scanmot not in self.scanmots:
+            raise RuntimeError(f"scanmot {scanmot} not in sample axes or energy")
         # if energy is given in kev convert to ev for xrayutilities
-        if m.floor(m.log10(attrs.get('energy'))) < 3:
-            enfix = 1000
+        enfix = 1000 if attrs.get('energy') < 1000 else 1
         energy = attrs.get('energy') * enfix  # x-ray energy in eV
 
+        geometry_key = (tuple(shape), xtal, det_obj.name, (bx, by, bz), detdist, energy, scanmot,
+                        attrs.get('scanmot_del'),
+                        tuple(attrs.get(axis) for axis in self.axes_mne))
+        if geometry_key in self.geometry_cache:
+            return self.geometry_cache[geometry_key]
+
         if scanmot == 'en':
-            scanen = np.array((energy, energy + attrs.get('scanmot_del') * enfix))
+            scanen = (energy, energy + attrs.get('scanmot_del') * enfix)
         else:
-            scanen = np.array((energy,))
-        qc = xuexp.QConversion(self.sampleaxes, self.detectoraxes, self.incidentaxis, en=scanen)
+            scanen = (energy,)
+
+        qc_key = (det_obj.name, scanen, shape[0], shape[1], detdist, px, py)
+        qc = self.qc_cache.get(qc_key)
+        if qc is None:
+            qc = xuexp.QConversion(self.sampleaxes, self.detectoraxes, self.incidentaxis, en=np.array(scanen))
 
-        # compute for 4pixel (2x2) detector
-        qc.init_area(det_obj.pixelorientation[0], det_obj.pixelorientation[1], shape[0], shape[1], 2, 2,
-                     distance=detdist, pwidth1=px, pwidth2=py)
+            # compute for 4pixel (2x2) detector
+            qc.init_area(det_obj.pixelorientation[0], det_obj.pixelorientation[1], shape[0], shape[1], 2, 2,
+                         distance=detdist, pwidth1=px, pwidth2=py)
+            self.qc_cache[qc_key] = qc
 
         # I think q2 will always be (3,2,2,2) (vec, scanarr, px, py)
         # should put some try except around this in case something goes wrong.
-        if scanmot == 'en':  # seems en scans always have to be treated differently since init is unique
-            q2 = np.array(qc.area(attrs.get('th'), attrs.get('chi'), attrs.get('phi'), attrs.get('delta'),
-                                  attrs.get('gamma'), deg=True))
-        elif scanmot in self.sampleaxes_mne:  # based on scanmot args are made for qc.area
-            args = []
-            axisindex = self.sampleaxes_mne.index(scanmot)
-            for n in range(len(self.sampleaxes_mne)):
-                if n == axisindex:
-                    scanstart = getattr(self, scanmot)
-                    args.append(np.array((scanstart, scanstart + attrs.get('scanmot_del') * binning[2])))
-                else:
-                    args.append(self.__dict__[self.sampleaxes_mne[n]])
-            for axis in self.detectoraxes_mne:
-                args.append(getattr(self, axis))
-            q2 = np.array(qc.area(*args, deg=True))
-        else:
-            print("scanmot not in sample axes or energy, exiting")
-            raise RuntimeError
+        # for en scans the scanned energies are set in QConversion,
+        # for other scans the scanned sample axis is given as start and end position
+        args = [attrs[axis] for axis in self.axes_mne]
+        if scanmot != 'en':
+            scanstart = attrs[scanmot]
+            args[self.sampleaxes_mne.index(scanmot)] = np.array((scanstart, scanstart + attrs.get('scanmot_del') * bz))
+        q2 = np.array(qc.area(*args, deg=True))
 
         # I think q2 will always be (3,2,2,2) (vec, scanarr, px, py)
-        Astar = q2[:, 0, 1, 0] - q2[:, 0, 0, 0]
-        Bstar = q2[:, 0, 0, 1] - q2[:, 0, 0, 0]
-        Cstar = q2[:, 1, 0, 0] - q2[:, 0, 0, 0]
+        # columns are Astar, Bstar, Cstar
+        Mstar = q2[:, (0, 0, 1), (1, 0, 0), (0, 1, 0)] - q2[:, 0, 0, 0][:, None]
 
         if xtal:
-            Trecip_cryst = np.zeros(9)
-            Trecip_cryst.shape = (3, 3)
-            Trecip_cryst[:, 0] = Astar * 10
-            Trecip_cryst[:, 1] = Bstar * 10
-            Trecip_cryst[:, 2] = Cstar * 10
+            Trecip_cryst = Mstar * 10
+            self.geometry_cache[geometry_key] = (Trecip_cryst, None)
             return Trecip_cryst, None
 
-        # transform to lab coords from sample reference frame
-        Astar = qc.transformSample2Lab(Astar, self.th, self.chi, self.phi) * 10.0  # convert to inverse nm.
-        Bstar = qc.transformSample2Lab(Bstar, self.th, self.chi, self.phi) * 10.0
-        Cstar = qc.transformSample2Lab(Cstar, self.th, self.chi, self.phi) * 10.0
-
-        denom = np.dot(Astar, np.cross(Bstar, Cstar))
-        A = 2 * m.pi * np.cross(Bstar, Cstar) / denom
-        B = 2 * m.pi * np.cross(Cstar, Astar) / denom
-        C = 2 * m.pi * np.cross(Astar, Bstar) / denom
+        # transform to lab coords from sample reference frame; the rotation applies to the last axis,
+        # so the vectors are passed as rows and the result is transposed back to columns
+        Trecip = qc.transformSample2Lab(Mstar.T, self.th, self.chi, self.phi).T * 10.0  # convert to inverse nm.
+        # the direct lattice vectors A, B, C satisfy A.Astar = 2pi, A.Bstar = 0, etc., so the
+        # direct matrix is the transposed inverse of the reciprocal matrix, times 2pi
+        Tdir = TWO_PI * np.linalg.inv(Trecip).T
 
-        Trecip = np.zeros(9)
-        Trecip.shape = (3, 3)
-        Trecip[:, 0] = Astar
-        Trecip[:, 1] = Bstar
-        Trecip[:, 2] = Cstar
+        self.geometry_cache[geometry_key] = (Trecip, Tdir)
+        return (Trecip, Tdir)
 
-        Tdir = np.zeros(9)
-        Tdir.shape = (3, 3)
-        Tdir = np.array((A, B, C)).transpose()
 
-        return (Trecip, Tdir)
+# maps diffractometer name to diffractometer class
+diffs = {diff_class.name: diff_class for diff_class in Diffractometer.__subclasses__()}
 
 
 def create_diffractometer(diff_name):
     if diff_name is None:
         print('diffractometer name not provided')
         return None
-    if diff_name == '34idc':
-        d = Diffractometer_34idc()
-        return d
-    else:
-        print (f'diffractometer {diff_name} not defined.')
-        return None
\ No newline at end of file
+    diff_class = diffs.get(diff_name)
+    if diff_class is None:
+        print(f'diffractometer {diff_name} not defined.')
+        return None
+    return diff_class()
@@ -9,24 +9,17 @@ from functools import partial
 def report_corr_err(q, ref_scan, dir_no, save_dir):
     col_gap = 2
     scan_col_width = 10
-    linesep = os.linesep
-    report_table = f'correlation errors related to scan {ref_scan}{linesep}{linesep}'
-    table_title = 'scan'
-    table_title += table_title[0].ljust(scan_col_width + col_gap)
-    table_title += f'correlation error{linesep}'
-    report_table += table_title
-
-    no = dir_no
-    while no > 0:
+    # the table is built as a list of lines, joined once
+    rows = [f'correlation errors related to scan {ref_scan}', '',
+            'scan' + 's'.ljust(scan_col_width + col_gap) + 'correlation error']
+    gap = ''.ljust(scan_col_width + col_gap)
+
+    for no in range(dir_no):
         (scan, err) = q.get()
-        row = str(scan)
-        row += ''.ljust(scan_col_width + col_gap)
-        row += f'{err}{linesep}'
-        report_table += row
-        no -= 1
+        rows.append(f'{scan}{gap}{err}')
 
     with open(ut.join(save_dir, f'corr_err_{ref_scan}.txt'), 'w+') as f:
-        f.write(report_table)
+        f.write(os.linesep.join(rows) + os.linesep)
         f.flush()
 
 
@@ -54,7 +47,7 @@ def read_align(get_scan_func, refarr, scan_dir):
     # align
     aligned_err = dvut.align_arrays_pixel(refarr, arr)
     [aligned, err] = aligned_err
-    return [np.absolute(aligned), err, scan]
+    return [np.absolute(aligned, dtype=np.float32), err, scan]
 
 
 def combine_scans(get_scan_func, scans_dirs, experiment_dir):
@@ -78,8 +71,8 @@ def combine_scans(get_scan_func, scans_dirs, experiment_dir):
 
     nproc = min(len(scans_dirs), os.cpu_count() * 2)
 
-    sumarr = np.zeros_like(refarr)
-    sumarr = sumarr + refarr
+    # the data is accumulated in single precision, which is sufficient for preprocessing
+    sumarr = refarr.astype(np.float32)
 
     func = partial(read_align, get_scan_func, refarr)
     with Pool(processes=nproc) as pool:
@@ -91,7 +84,7 @@ def combine_scans(get_scan_func, scans_dirs, experiment_dir):
     if len(results) > 0:
         for res in results[0]:
             [ar, er, scan] = res
-            sumarr = sumarr + ar
+            sumarr += ar
             q.put((scan, er))
     else:
         print(f'did not find any scans to align with {refscan}')
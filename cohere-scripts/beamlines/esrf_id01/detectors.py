@@ -4,6 +4,8 @@ from abc import ABC, abstractmethod
 
 
 class Detector(ABC):
+    h5_cache_mb = 64  # size of HDF5 chunk cache, can be overridden with h5_cache_mb in config_instr
+
     def __init__(self, name="default"):
         self.name = name
 
@@ -47,7 +49,7 @@ class Detector(ABC):
         """
         # TODO: need to find out how to parse roi from the h5file. For now it will return the full data.
         # It can be cropped during standard preprocessing
-        with h5py.File(h5file, "r") as h5f:
+        with h5py.File(h5file, "r", rdcc_nbytes=self.h5_cache_mb * 1024 * 1024, rdcc_nslots=1_000_003, rdcc_w0=0.75) as h5f:
             data = np.array(h5f[node])
 
         # apply correction if needed
@@ -84,10 +86,14 @@ class Detector_mpxgaas(Detector):
         super(Detector_mpxgaas, self).__init__(self.name)
 
 
+# maps detector name to detector class
+dets = {det_class.name: det_class for det_class in Detector.__subclasses__()}
+
+
 def create_detector(det_name):
-    if det_name == 'mpxgaas':
-        return Detector_mpxgaas()
-    else:
-        print (f'detector {det_name} not defined.')
+    det_class = dets.get(det_name)
+    if det_class is None:
+        print(f'detector {det_name} not defined.')
         return None
+    return det_class()
 
@@ -5,6 +5,8 @@ import h5py
 import beamlines.esrf_id01.detectors as det
 from abc import ABC, abstractmethod
 
+TWO_PI = 2 * m.pi
+
 
 class Diffractometer(ABC):
 
@@ -44,12 +46,22 @@ class Diffractometer_id01(Diffractometer):
     sampleaxes_mne = ('mu', 'eta', 'phi')
     detectoraxes_name = ('Nu', 'Delta')
     detectoraxes_mne = ('nu', 'delta')
+    # order of axes in qc.area arguments
+    axes_mne = sampleaxes_mne + detectoraxes_mne
+    # motors that can be scanned
+    scanmots = frozenset(sampleaxes_mne + ('en',))
     detectordist_name = 'distance'
     detectordist_mne = 'detdist'
+    # parameters that must be parsed or configured to calculate geometry, in addition to the axes
+    geometry_params = ('detdist', 'energy', 'scanmot', 'scanmot_del')
+    h5_cache_mb = 64  # size of HDF5 chunk cache, can be overridden with h5_cache_mb in config_instr
 
 
     def __init__(self):
         super(Diffractometer_id01, self).__init__('id01')
+        # detector objects and initialized QConversion objects reused by scans with the same setup
+        self.det_objs = {}
+        self.qc_cache = {}
 
 
     def parse_h5(self, h5file, scan, detector):
@@ -74,7 +86,8 @@ class Diffractometer_id01(Diffractometer):
         h5_dict = {}
 
         # Scan numbers start at one but the list is 0 indexed
-        h5f = h5py.File(h5file)
+        # the positioners are small datasets scattered in the file, a bigger chunk cache avoids re-reading chunks
+        h5f = h5py.File(h5file, 'r', rdcc_nbytes=self.h5_cache_mb * 1024 * 1024, rdcc_nslots=1_000_003, rdcc_w0=0.75)
         info = h5f[f"{scan}.1"]
 
         try:
@@ -122,99 +135,82 @@ class Diffractometer_id01(Diffractometer):
         """
         attrs = self.parse_h5(h5file, scan, detector)
         attrs.update(kwargs)
-        binning = attrs.get('binning', [1, 1, 1])
+        missing = set(self.geometry_params + self.axes_mne) - attrs.keys()
+        if len(missing) > 0:
+            raise RuntimeError(f'parameters not parsed and not configured: {sorted(missing)}, cannot calculate geometry')
+        bx, by, bz = attrs.get('binning', (1, 1, 1))
 
         # set the attributes with values parsed from spec and then possibly overridden by configuration
         for attr in attrs:
             setattr(self, attr, attrs[attr])
 
-        det_obj = det.create_detector(detector)
-        px = det_obj.pixel[0] * binning[0]
-        py = det_obj.pixel[1] * binning[1]
+        if detector not in self.det_objs:
+            self.det_objs[detector] = det.create_detector(detector)
+        det_obj = self.det_objs[detector]
+        px = det_obj.pixel[0] * bx
+        py = det_obj.pixel[1] * by
 
         detdist = attrs.get('detdist') / 1000.0  # convert to meters
         scanmot = attrs.get('scanmot').strip()
-        enfix = 1
+        if scanmot not in self.scanmots:
+            raise RuntimeError(f"{__name__}: scanmot {scanmot} not in sample axes or energy")
         # if energy is given in kev convert to ev for xrayutilities
-        if m.floor(m.log10(self.energy)) < 3:
-            enfix = 1000
+        enfix = 1000 if self.energy < 1000 else 1
         energy = self.energy * enfix  # x-ray energy in eV
 
         if scanmot == 'en':
-            scanen = np.array((energy, energy + attrs.get('scanmot_del') * enfix))
+            scanen = (round(energy, 6), round(energy + attrs.get('scanmot_del') * enfix, 6))
         else:
-            scanen = np.array((energy,))
-        qc = xuexp.QConversion(self.sampleaxes, self.detectoraxes, self.incidentaxis, en=scanen)
+            scanen = (round(energy, 6),)
+
+        qc_key = (detector, scanen, shape[0], shape[1], detdist, px, py)
+        qc = self.qc_cache.get(qc_key)
+        if qc is None:
+            qc = xuexp.QConversion(self.sampleaxes, self.detectoraxes, self.incidentaxis, en=np.array(scanen))
 
-        # compute for 4pixel (2x2) detector
-        qc.init_area(det_obj.pixelorientation[0], det_obj.pixelorientation[1], shape[0], shape[1], 2, 2,
-                     distance=detdist, pwidth1=px, pwidth2=py)
+            # compute for 4pixel (2x2) detector
+            qc.init_area(det_obj.pixelorientation[0], det_obj.pixelorientation[1], shape[0], shape[1], 2, 2,
+                         distance=detdist, pwidth1=px, pwidth2=py)
+            self.qc_cache[qc_key] = qc
 
         # I think q2 will always be (3,2,2,2) (vec, scanarr, px, py)
         # should put some try except around this in case something goes wrong.
-        if scanmot == 'en':  # seems en scans always have to be treated differently since init is unique
-            q2 = np.array(qc.area(attrs.get('mu'), attrs.get('eta'), attrs.get('phi'), 
-                                  attrs.get('nu'), attrs.get('delta'), deg=True))
-        elif scanmot in self.sampleaxes_mne:  # based on scanmot args are made for qc.area
-            args = []
-            axisindex = self.sampleaxes_mne.index(scanmot)
-            for n in range(len(self.sampleaxes_mne)):
-                if n == axisindex:
-                    scanstart = getattr(self, scanmot)
-                    args.append(np.array((scanstart, scanstart + attrs.get('scanmot_del') * binning[2])))
-                else:
-                    args.append(self.__dict__[self.sampleaxes_mne[n]])
-            for axis in self.detectoraxes_mne:
-                args.append(getattr(self, axis))
-            q2 = np.array(qc.area(*args, deg=True))
-        else:
-            print(f"{__name__}: scanmot not in sample axes or energy, exiting")
-            raise RuntimeError
+        # for en scans the scanned energies are set in QConversion,
+        # for other scans the scanned sample axis is given as start and end position
+        args = [attrs[axis] for axis in self.axes_mne]
+        if scanmot != 'en':
+            scanstart = attrs[scanmot]
+            args[self.sampleaxes_mne.index(scanmot)] = np.array((scanstart, scanstart + attrs.get('scanmot_del') * bz))
+        q2 = np.array(qc.area(*args, deg=True))
 
         # I think q2 will always be (3,2,2,2) (vec, scanarr, px, py)
-        Astar = q2[:, 0, 1, 0] - q2[:, 0, 0, 0]
-        Bstar = q2[:, 0, 0, 1] - q2[:, 0, 0, 0]
-        Cstar = q2[:, 1, 0, 0] - q2[:, 0, 0, 0]
+        # columns are Astar, Bstar, Cstar
+        Mstar = q2[:, (0, 0, 1), (1, 0, 0), (0, 1, 0)] - q2[:, 0, 0, 0][:, None]
 
         if xtal:
-            Trecip_cryst = np.zeros(9)
-            Trecip_cryst.shape = (3, 3)
-            Trecip_cryst[:, 0] = Astar * 10
-            Trecip_cryst[:, 1] = Bstar * 10
-            Trecip_cryst[:, 2] = Cstar * 10
+            Trecip_cryst = Mstar * 10
             return Trecip_cryst, None
 
-        # transform to lab coords from sample reference frame
-        Astar = qc.transformSample2Lab(Astar, self.mu, self.eta, self.phi) * 10.0  # convert to inverse nm.
-        Bstar = qc.transformSample2Lab(Bstar, self.mu, self.eta, self.phi) * 10.0
-        Cstar = qc.transformSample2Lab(Cstar, self.mu, self.eta, self.phi) * 10.0
+        # transform to lab coords from sample reference frame; the rotation applies to the last axis,
+        # so the vectors are passed as rows and the result is transposed back to columns
+        Trecip = qc.transformSample2Lab(Mstar.T, self.mu, self.eta, self.phi).T * 10.0  # convert to inverse nm.
+        # the direct lattice vectors A, B, C satisfy A.Astar = 2pi, A.Bstar = 0, etc., so the
+        # direct matrix is the transposed inverse of the reciprocal matrix, times 2pi
+        Tdir = TWO_PI * np.linalg.inv(Trecip).T
 
-        denom = np.dot(Astar, np.cross(Bstar, Cstar))
-        A = 2 * m.pi * np.cross(Bstar, Cstar) / denom
-        B = 2 * m.pi * np.cross(Cstar, Astar) / denom
-        C = 2 * m.pi * np.cross(Astar, Bstar) / denom
-
-        Trecip = np.zeros(9)
-        Trecip.shape = (3, 3)
-        Trecip[:, 0] = Astar
-        Trecip[:, 1] = Bstar
-        Trecip[:, 2] = Cstar
+        return (Trecip, Tdir)
 
-        Tdir = np.zeros(9)
-        Tdir.shape = (3, 3)
-        Tdir = np.array((A, B, C)).transpose()
 
-        return (Trecip, Tdir)
+# maps diffractometer name to diffractometer class
+diffs = {diff_class.name: diff_class for diff_class in Diffractometer.__subclasses__()}
 
 
 def create_diffractometer(diff_name):
     if diff_name is None:
         print('diffractometer name not provided')
         return None
-    if diff_name == 'id01':
-        d = Diffractometer_id01()
-        return d
-    else:
-        print (f'diffractometer {diff_name} not defined.')
+    diff_class = diffs.get(diff_name)
+    if diff_class is None:
+        print(f'diffractometer {diff_name} not defined.')
         return None
-        
+    return diff_class()
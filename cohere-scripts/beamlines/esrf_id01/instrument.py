@@ -147,5 +147,13 @@ def create_instr(params):
         return None
     instr = Instrument(h5file, diffractometer, detector)
 
+    # tune the HDF5 chunk cache size (MB) used when reading the h5file
+    h5_cache_mb = params.get('h5_cache_mb', None)
+    if h5_cache_mb is not None:
+        if instr.diff_obj is not None:
+            instr.diff_obj.h5_cache_mb = h5_cache_mb
+        if instr.det_obj is not None:
+            instr.det_obj.h5_cache_mb = h5_cache_mb
+
     return instr
 
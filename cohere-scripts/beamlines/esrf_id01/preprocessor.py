@@ -8,51 +8,19 @@ import cohere_core.utilities.dvc_utils as dvut
 def report_corr_err(ref_scan, scans_errs, save_dir):
     col_gap = 2
     scan_col_width = 10
-    linesep = os.linesep
-    report_table = f'correlation errors related to scan {ref_scan}{linesep}{linesep}'
-    table_title = 'scan'
-    table_title += table_title[0].ljust(scan_col_width + col_gap)
-    table_title += f'correlation error{linesep}'
-    report_table += table_title
+    # the table is built as a list of lines, joined once
+    rows = [f'correlation errors related to scan {ref_scan}', '',
+            'scan' + 's'.ljust(scan_col_width + col_gap) + 'correlation error']
 
     for scan, err in scans_errs:
-        row = str(scan)
-        row += row[0].ljust(scan_col_width + col_gap)
-        row += f'{err}{linesep}'
-        report_table += row
+        scan = str(scan)
+        rows.append(f'{scan}{scan[0].ljust(scan_col_width + col_gap)}{err}')
 
     with open(ut.join(save_dir, f'corr_err_{ref_scan}.txt'), 'w+') as f:
-        f.write(report_table)
+        f.write(os.linesep.join(rows) + os.linesep)
         f.flush()
 
 
-def read_align(get_scan_func, refarr, scan_node):
-    """
-    Aligns scan with reference array and enqueues the correlation error.
-    Parameters
-    ----------
-    prep_obj : Object
-        contains attributes for data preprocess
-    refarr : ndarray
-        reference array
-    dir : str
-        directory to the raw data
-    q : Queue
-        queue for passing the correlation error to the reporting process
-    Returns
-    -------
-    aligned_array : array
-        aligned array
-    """
-    (scan, node) = scan_node
-    # read
-    arr = get_scan_func(node)
-    # align
-    aligned_err = dvut.align_arrays_pixel(refarr, arr)
-    [aligned, err] = aligned_err
-    return [np.absolute(aligned), err, scan]
-
-
 def combine_scans(get_scan_func, scans_nodes, experiment_dir):
     (refscan, refnode) = scans_nodes.pop(0)
     refarr = get_scan_func(refnode)
@@ -61,13 +29,13 @@ def combine_scans(get_scan_func, scans_nodes, experiment_dir):
     # array on gpu memory. Setting library here before starting multiple processes
     dvut.set_lib_from_pkg('np')
 
-    sumarr = np.zeros_like(refarr)
-    sumarr = sumarr + refarr
+    # the data is accumulated in single precision, which is sufficient for preprocessing
+    sumarr = refarr.astype(np.float32)
     scans_errs = []
-    for scan_node in scans_nodes:
-        ar, er, scan = read_align(get_scan_func, refarr, scan_node)
+    for (scan, node) in scans_nodes:
+        aligned, er = dvut.align_arrays_pixel(refarr, get_scan_func(node))
         scans_errs.append((scan, er))
-        sumarr = sumarr + ar
+        sumarr += np.absolute(aligned, dtype=np.float32)
 
     report_corr_err(refscan, scans_errs, experiment_dir)
     # results = []
@@ -19,16 +19,125 @@ __all__ = ['select_file',
 import sys
 import os
 import argparse
-import shutil
-from PyQt5.QtCore import *
-from PyQt5.QtGui import *
-from PyQt5.QtWidgets import *
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import (QApplication, QCheckBox, QComboBox, QFileDialog, QFormLayout, QHBoxLayout,
+                             QInputDialog, QLineEdit, QListWidget, QMessageBox, QPushButton, QSpacerItem,
+                             QStackedWidget, QTabWidget, QVBoxLayout, QWidget)
 import importlib
-import convertconfig as conv
+import pkgutil
+import threading
 import ast
+import copy
 import cohere_core.utilities as ut
 import common as com
 
+# configuration files loaded with experiment, in addition to main config
+CONF_LIST = ('config_prep', 'config_data', 'config_rec', 'config_disp', 'config_instr', 'config_mp')
+# prefix of alternate reconstruction configuration files, followed by the rec id
+REC_PREFIX = 'config_rec_'
+
+
+def parse_device(text):
+    """
+    Parses device parameter, either 'all' or a literal.
+    """
+    if text == 'all':
+        return text
+    return com.parse_literal(text)
+
+
+# configurations written or read by the window, keyed on file name, holding file stamp and configuration
+config_cache = {}
+
+
+def file_stamp(conf_file):
+    """
+    Returns modification time and size of the file. The size catches a rewrite within the modification time
+    resolution of file system.
+    """
+    st = os.stat(conf_file)
+    return st.st_mtime_ns, st.st_size
+
+
+def write_config(conf_map, conf_file):
+    """
+    Writes configuration to file and keeps it in cache, so it is not parsed when read back. The file is not
+    written if it holds the same configuration, i.e. it was written with it and did not change since.
+    """
+    cached = config_cache.get(conf_file)
+    if cached is not None and cached[1] == conf_map:
+        try:
+            if file_stamp(conf_file) == cached[0]:
+                return
+        except OSError:
+            pass
+    ut.write_config(conf_map, conf_file)
+    config_cache[conf_file] = (file_stamp(conf_file), copy.deepcopy(conf_map))
+
+
+def read_config(conf_file):
+    """
+    Returns configuration from file. The cached configuration is returned if the file did not change since
+    it was cached.
+    """
+    try:
+        stamp = file_stamp(conf_file)
+    except OSError:
+        return None
+    cached = config_cache.get(conf_file)
+    if cached is None or cached[0] != stamp:
+        conf_map = ut.read_config(conf_file)
+        if conf_map is None:
+            return None
+        cached = (stamp, conf_map)
+        config_cache[conf_file] = cached
+    return copy.deepcopy(cached[1])
+
+
+# configuration last verified and the verifier message for it, keyed on configuration name
+verified = {}
+
+
+def verify(conf_name, conf_map):
+    """
+    Verifies configuration with ut.verify. The verification depends only on the parameters, so the result is
+    reused when the configuration did not change since last verified.
+    """
+    last = verified.get(conf_name)
+    if last is not None and last[0] == conf_map:
+        return last[1]
+    er_msg = ut.verify(conf_name, conf_map)
+    verified[conf_name] = (copy.deepcopy(conf_map), er_msg)
+    return er_msg
+
+
+def find_data_file(experiment_dir, data_dir, file_names):
+    """
+    Checks if any of the files is present in the data directory of experiment, or of the experiment subdirectories,
+    i.e. scan and multipeak directories. Only the known layout is probed, the experiment tree is not walked.
+    Parameters
+    ----------
+    experiment_dir : str
+        experiment directory
+    data_dir : str
+        name of directory holding the file, ex: preprocessed_data
+    file_names : tuple
+        names of files to look for
+    Returns
+    -------
+    boolean
+        True if any of the files was found, False otherwise
+    """
+    dirs = [experiment_dir]
+    with os.scandir(experiment_dir) as entries:
+        dirs.extend(entry.path for entry in entries if entry.is_dir())
+    for dir in dirs:
+        for file_name in file_names:
+            if os.path.isfile(ut.join(dir, data_dir, file_name)):
+                return True
+    return False
+
 
 def select_file(start_dir):
     """
@@ -42,14 +151,9 @@ def select_file(start_dir):
     str
         name of selected file or None
     """
-    start_dir = start_dir.replace(os.sep, '/')
-    dialog = QFileDialog(None, 'select dir', start_dir)
-    dialog.setFileMode(QFileDialog.ExistingFile)
-    dialog.setSidebarUrls([QUrl.fromLocalFile(start_dir)])
-    if dialog.exec_() == QDialog.Accepted:
-        return str(dialog.selectedFiles()[0]).replace(os.sep, '/')
-    else:
-        return None
+    # the native dialog lists the directory much faster than the Qt dialog
+    file_name, _ = QFileDialog.getOpenFileName(None, 'select file', com.norm_path(start_dir))
+    return com.norm_path(file_name) or None
 
 
 def select_dir(start_dir):
@@ -64,14 +168,17 @@ def select_dir(start_dir):
     str
         name of selected directory or None
     """
-    start_dir = start_dir.replace(os.sep, '/')
-    dialog = QFileDialog(None, 'select dir', start_dir)
-    dialog.setFileMode(QFileDialog.DirectoryOnly)
-    dialog.setSidebarUrls([QUrl.fromLocalFile(start_dir)])
-    if dialog.exec_() == QDialog.Accepted:
-        return str(dialog.selectedFiles()[0]).replace(os.sep, '/')
-    else:
-        return None
+    # the native dialog lists the directory much faster than the Qt dialog
+    dir_name = QFileDialog.getExistingDirectory(None, 'select dir', com.norm_path(start_dir),
+                                                QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks)
+    return com.norm_path(dir_name) or None
+
+
+def compact(value):
+    """
+    Returns value as text without spaces, as displayed in fields.
+    """
+    return str(value).replace(' ', '')
 
 
 def msg_window(text):
@@ -92,6 +199,31 @@ def msg_window(text):
     msg.exec_()
 
 
+class ConfigLoader(QObject, QRunnable):
+    """
+    Reads experiment configuration files in a thread pool, so the window stays responsive while the files
+    are read. The result is delivered with loaded signal.
+    """
+    loaded = pyqtSignal(object, bool)
+
+    def __init__(self, load_dir, conf_list):
+        QObject.__init__(self)
+        QRunnable.__init__(self)
+        # the loader is kept by the window until the result is delivered
+        self.setAutoDelete(False)
+        self.load_dir = load_dir
+        self.conf_list = conf_list
+
+
+    def run(self):
+        try:
+            conf_dicts, converted = com.get_config_maps(self.load_dir, self.conf_list)
+        except Exception as e:
+            print(e)
+            conf_dicts, converted = None, False
+        self.loaded.emit(conf_dicts, converted)
+
+
 class cdi_gui(QWidget):
     def __init__(self, parent=None):
         """
@@ -110,7 +242,17 @@ class cdi_gui(QWidget):
         self.id = None
         self.exp_id = None
         self.experiment_dir = None
+        self.conf_dir = None
         self.working_dir = None
+        self.config_loader = None
+        # set while the window is filled from configuration, the toggle handlers do not save then
+        self.loading = False
+        # the toggle handlers save main config after a short delay, so a burst of changes is saved once
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(100)
+        self.save_timer.timeout.connect(self.save_main)
+        QApplication.instance().aboutToQuit.connect(self.flush_save)
 
         uplayout = QHBoxLayout()
         luplayout = QFormLayout()
@@ -126,6 +268,15 @@ class cdi_gui(QWidget):
         luplayout.addRow("scan(s)", self.scan_widget)
         self.beamline_widget = QLineEdit()
         ruplayout.addRow("beamline", self.beamline_widget)
+        # cleaned texts of the experiment fields, updated when the fields change
+        self.id_text = ''
+        self.scan_text = ''
+        self.beamline_text = ''
+        # experiment name resolved from id and scan fields
+        self.exp_id_text = ''
+        self.Id_widget.textChanged.connect(self.update_id_text)
+        self.scan_widget.textChanged.connect(self.update_scan_text)
+        self.beamline_widget.textChanged.connect(lambda text: setattr(self, 'beamline_text', text.strip()))
         scan_layout = QHBoxLayout()
         self.auto_data = QCheckBox('auto data')
         self.auto_data.setChecked(False)
@@ -201,6 +352,7 @@ class cdi_gui(QWidget):
     def reset_window(self):
         self.exp_id = None
         self.experiment_dir = None
+        self.conf_dir = None
         self.working_dir = None
         self.set_work_dir_button.setText('')
         self.Id_widget.setText('')
@@ -235,6 +387,23 @@ class cdi_gui(QWidget):
             return
 
 
+    def update_id_text(self, text):
+        self.id_text = text.strip()
+        self.update_exp_id_text()
+
+
+    def update_scan_text(self, text):
+        self.scan_text = text.replace(' ', '')
+        self.update_exp_id_text()
+
+
+    def update_exp_id_text(self):
+        if self.scan_text == '':
+            self.exp_id_text = self.id_text
+        else:
+            self.exp_id_text = f'{self.id_text}_{self.scan_text}'
+
+
     def is_exp_exists(self):
         """
         Determines if minimum information for creating the experiment space exists, i.e the working directory and experiment id must be set.
@@ -251,13 +420,7 @@ class cdi_gui(QWidget):
             return False
         if self.working_dir is None:
             return False
-        exp_id = str(self.Id_widget.text()).strip()
-        scan = str(self.scan_widget.text()).replace(' ','')
-        if scan != '':
-            exp_id = f'{exp_id}_{scan}'
-        if not os.path.exists(ut.join(self.working_dir, exp_id)):
-            return False
-        return True
+        return os.path.isdir(ut.join(self.working_dir, self.exp_id_text))
 
 
     def is_exp_set(self):
@@ -275,7 +438,7 @@ class cdi_gui(QWidget):
             return False
         if self.working_dir is None:
             return False
-        if self.id != str(self.Id_widget.text()).strip():
+        if self.id != self.id_text:
             return False
         return True
 
@@ -290,6 +453,9 @@ class cdi_gui(QWidget):
         -------
         nothing
         """
+        if self.config_loader is not None:
+            # previous experiment is still loading
+            return
         self.loaded = False
         self.reset_window()
         load_dir = select_dir(os.getcwd())
@@ -300,14 +466,37 @@ class cdi_gui(QWidget):
             msg_window('missing conf/config file, not experiment directory')
             return
 
-        conf_list = ['config_prep', 'config_data', 'config_rec', 'config_disp', 'config_instr', 'config_mp']
-        conf_dicts, converted = com.get_config_maps(load_dir, conf_list)
+        # the configuration files are read in a thread, the experiment is set when they are loaded
+        self.config_loader = ConfigLoader(load_dir, CONF_LIST)
+        self.config_loader.loaded.connect(self.on_configs_loaded)
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        QThreadPool.globalInstance().start(self.config_loader)
+
+
+    def on_configs_loaded(self, conf_dicts, converted):
+        """
+        Sets the experiment from configuration dictionaries read by ConfigLoader.
+        Parameters
+        ----------
+        conf_dicts : dict
+            configuration dictionaries keyed on configuration name, None if reading failed
+        converted : boolean
+            True if the configuration was converted to the current version
+        Returns
+        -------
+        nothing
+        """
+        QApplication.restoreOverrideCursor()
+        self.config_loader = None
+        if conf_dicts is None:
+            msg_window('cannot read experiment configuration')
+            return
 
         self.load_main(conf_dicts['config'])
 
         if self.t is None:
             try:
-                self.t = Tabs(self, self.beamline_widget.text())
+                self.t = Tabs(self, self.beamline_text)
                 self.vbox.addWidget(self.t)
             except:
                 pass
@@ -334,24 +523,28 @@ class cdi_gui(QWidget):
         -------
         nothing
         """
-        if 'working_dir' in conf_map:
-            working_dir = conf_map['working_dir'].replace(os.sep, '/')
-            self.set_work_dir_button.setStyleSheet("Text-align:left")
-            self.set_work_dir_button.setText(working_dir)
-        if 'experiment_id' in conf_map:
-            self.Id_widget.setText(conf_map['experiment_id'])
-        if 'scan' in conf_map:
-            self.scan_widget.setText(conf_map['scan'].replace(' ',''))
-        if 'beamline' in conf_map:
-            self.beamline_widget.setText(conf_map['beamline'])
-        if 'auto_data' in conf_map and conf_map['auto_data']:
-            self.auto_data.setChecked(True)
-        if 'separate_scans' in conf_map and conf_map['separate_scans']:
-            self.separate_scans.setChecked(True)
-        if 'separate_scan_ranges' in conf_map and conf_map['separate_scan_ranges']:
-            self.separate_scan_ranges.setChecked(True)
-        if 'multipeak' in conf_map and conf_map['multipeak']:
-            self.multipeak.setChecked(True)
+        self.loading = True
+        try:
+            if 'working_dir' in conf_map:
+                working_dir = com.norm_path(conf_map['working_dir'])
+                self.set_work_dir_button.setStyleSheet("Text-align:left")
+                self.set_work_dir_button.setText(working_dir)
+            if 'experiment_id' in conf_map:
+                self.Id_widget.setText(conf_map['experiment_id'])
+            if 'scan' in conf_map:
+                self.scan_widget.setText(conf_map['scan'].replace(' ',''))
+            if 'beamline' in conf_map:
+                self.beamline_widget.setText(conf_map['beamline'])
+            if 'auto_data' in conf_map and conf_map['auto_data']:
+                self.auto_data.setChecked(True)
+            if 'separate_scans' in conf_map and conf_map['separate_scans']:
+                self.separate_scans.setChecked(True)
+            if 'separate_scan_ranges' in conf_map and conf_map['separate_scan_ranges']:
+                self.separate_scan_ranges.setChecked(True)
+            if 'multipeak' in conf_map and conf_map['multipeak']:
+                self.multipeak.setChecked(True)
+        finally:
+            self.loading = False
 
 
     def assure_experiment_dir(self):
@@ -364,21 +557,27 @@ class cdi_gui(QWidget):
         -------
         nothing
         """
-        if not os.path.exists(self.experiment_dir):
-            os.makedirs(self.experiment_dir)
-        experiment_conf_dir = ut.join(self.experiment_dir, 'conf')
-        if not os.path.exists(experiment_conf_dir):
-            os.makedirs(experiment_conf_dir)
+        # creates both directories if needed
+        os.makedirs(self.conf_dir, exist_ok=True)
+
+
+    def flush_save(self):
+        # save main config now if the save is still waiting on the timer
+        if self.save_timer.isActive():
+            self.save_timer.stop()
+            self.save_main()
 
 
     def save_main(self):
         # read the configurations from GUI and write to experiment config files
         # save the main config
+        import convertconfig as conv
+
         conf_map = {}
         conf_map['working_dir'] = str(self.working_dir)
         conf_map['experiment_id'] = self.id
-        if len(self.scan_widget.text()) > 0:
-            conf_map['scan'] = str(self.scan_widget.text())
+        if len(self.scan_text) > 0:
+            conf_map['scan'] = self.scan_text
         if self.beamline is not None:
             conf_map['beamline'] = self.beamline
         if self.multipeak.isChecked():
@@ -390,13 +589,14 @@ class cdi_gui(QWidget):
         if self.separate_scan_ranges.isChecked():
             conf_map['separate_scan_ranges'] = True
         conf_map['converter_ver'] = conv.get_version()
-        er_msg = ut.verify('config', conf_map)
+        conf_file = ut.join(self.conf_dir, 'config')
+        er_msg = verify('config', conf_map)
         if len(er_msg) > 0:
             msg_window(er_msg)
-            if self.no_verify:
-                ut.write_config(conf_map, ut.join(self.experiment_dir, 'conf', 'config'))
-        else:
-            ut.write_config(conf_map, ut.join(self.experiment_dir, 'conf', 'config'))
+            if not self.no_verify:
+                return
+        # the toggle handlers save main config on each change, write_config skips the file if it did not change
+        write_config(conf_map, conf_file)
 
 
     def set_experiment(self, loaded=False):
@@ -411,7 +611,7 @@ class cdi_gui(QWidget):
         -------
         nothing
         """
-        working_dir = self.set_work_dir_button.text().replace(os.sep, '/')
+        working_dir = com.norm_path(self.set_work_dir_button.text())
         if len(working_dir) == 0:
             msg_window(
                 'The working directory is not defined in config file. Select valid working directory and set experiment')
@@ -427,22 +627,20 @@ class cdi_gui(QWidget):
             self.set_work_dir_button.setText('')
             return
 
-        id = str(self.Id_widget.text()).strip()
+        id = self.id_text
         if id == '':
             msg_window('id must be entered')
             return
 
         self.working_dir = working_dir
         self.id = id
-        if len(self.scan_widget.text()) > 0:
-            self.exp_id = f'{self.id}_{str(self.scan_widget.text()).replace(" ","")}'
-        else:
-            self.exp_id = self.id
+        self.exp_id = self.exp_id_text
         self.experiment_dir = ut.join(self.working_dir, self.exp_id)
+        self.conf_dir = ut.join(self.experiment_dir, 'conf')
         self.assure_experiment_dir()
 
-        if len(self.beamline_widget.text().strip()) > 0:
-            self.beamline = str(self.beamline_widget.text()).strip()
+        if len(self.beamline_text) > 0:
+            self.beamline = self.beamline_text
             if not self.t is None:
                 self.t.update_beamline(self.beamline)
         else:
@@ -450,7 +648,7 @@ class cdi_gui(QWidget):
 
         if self.t is None:
             try:
-                self.t = Tabs(self, self.beamline_widget.text())
+                self.t = Tabs(self, self.beamline_text)
                 self.vbox.addWidget(self.t)
             except Exception as e:
                 print(e.text())
@@ -463,27 +661,27 @@ class cdi_gui(QWidget):
         #self.t.notify(**{'experiment_dir': self.experiment_dir})
 
     def toggle_multipeak(self):
-        if self.is_exp_set():
-            self.save_main()
+        if self.is_exp_set() and not self.loading:
+            self.save_timer.start()
         if not self.t is None:
             self.t.toggle_checked(self.multipeak.isChecked(), True)
 
     def toggle_separate_scans(self):
-        if self.is_exp_set():
-            self.save_main()
+        if self.is_exp_set() and not self.loading:
+            self.save_timer.start()
         if not self.t is None:
             self.t.toggle_checked(self.separate_scans.isChecked(), False)
 
     def toggle_separate_scan_ranges(self):
-        if self.is_exp_set():
-            self.save_main()
+        if self.is_exp_set() and not self.loading:
+            self.save_timer.start()
         if not self.t is None:
             self.t.toggle_checked(self.separate_scan_ranges.isChecked(), False)
 
 
     def toggle_auto_data(self):
-        if self.is_exp_set():
-            self.save_main()
+        if self.is_exp_set() and not self.loading:
+            self.save_timer.start()
 
 
 class Tabs(QTabWidget):
@@ -492,6 +690,9 @@ class Tabs(QTabWidget):
     The tabs are as follows: prep (prepare data), data (format data), rec (reconstruction), disp (visualization).
     This class holds holds the tabs.
     """
+    # beamline tabs modules imported so far, keyed on beamline
+    beam_modules = {}
+
     def __init__(self, main_win, beamline, parent=None):
         """
         Constructor, initializes the tabs.
@@ -500,12 +701,7 @@ class Tabs(QTabWidget):
         self.main_win = main_win
 
         if beamline is not None and len(beamline) > 0:
-            try:
-                self.beam = importlib.import_module(f'beamlines.{beamline}.beam_tabs')
-            except Exception as e:
-                print (e)
-                msg_window(f'cannot import beamlines.{beamline} module')
-                raise
+            self.beam = self.get_beam_module(beamline)
             self.instr_tab = self.beam.InstrTab()
             self.prep_tab = self.beam.PrepTab()
             self.format_tab = DataTab()
@@ -528,16 +724,25 @@ class Tabs(QTabWidget):
             tab.init(self, main_win)
 
 
+    def get_beam_module(self, beamline):
+        """
+        Returns the beam_tabs module for the beamline. The module is imported once and reused.
+        """
+        if beamline not in Tabs.beam_modules:
+            try:
+                Tabs.beam_modules[beamline] = importlib.import_module(f'beamlines.{beamline}.beam_tabs')
+            except Exception as e:
+                print (e)
+                msg_window(f'cannot import beamlines.{beamline} module')
+                raise
+        return Tabs.beam_modules[beamline]
+
+
     def update_beamline(self, beamline):
         # a case when beamline tab is already set
         if not self.instr_tab is None:
             return
-        try:
-            self.beam = importlib.import_module(f'beamlines.{beamline}.beam_tabs')
-        except Exception as e:
-            print (e)
-            msg_window(f'cannot import beamlines.{beamline} module')
-            raise
+        self.beam = self.get_beam_module(beamline)
         self.instr_tab = self.beam.InstrTab()
         self.insertTab(0, self.instr_tab, self.instr_tab.name)
         self.instr_tab.init(self, self.main_win)
@@ -558,17 +763,24 @@ class Tabs(QTabWidget):
 
 
     def clear_configs(self):
-        for tab in self.tabs:
-            tab.clear_conf()
+        # tabs are repainted once, after all fields are cleared
+        self.setUpdatesEnabled(False)
+        try:
+            for tab in self.tabs:
+                tab.clear_conf()
+        finally:
+            self.setUpdatesEnabled(True)
 
 
     def run_all(self):
+        self.main_win.flush_save()
         for tab in self.tabs:
             tab.run_tab()
 
     def run_prep(self):
         import beamline_preprocess as prep
 
+        self.main_win.flush_save()
         # this line is passing all parameters from command line to prep script. 
         # if there are other parameters, one can add some code here
         msg = prep.handle_prep(self.main_win.experiment_dir, no_verify=self.main_win.no_verify)
@@ -578,18 +790,25 @@ class Tabs(QTabWidget):
     def run_viz(self):
         import beamline_visualization as dp
 
+        self.main_win.flush_save()
         msg = dp.handle_visualization(self.main_win.experiment_dir, no_verify=self.main_win.no_verify)
         if len(msg) > 0:
             msg_window(msg)
 
 
     def load_conf(self, conf_dirs):
-        for tab in self.tabs:
-            if tab.conf_name in conf_dirs.keys():
-                tab.load_tab(conf_dirs[tab.conf_name])
+        # tabs are repainted once, after all fields are set
+        self.setUpdatesEnabled(False)
+        try:
+            for tab in self.tabs:
+                if tab.conf_name in conf_dirs.keys():
+                    tab.load_tab(conf_dirs[tab.conf_name])
+        finally:
+            self.setUpdatesEnabled(True)
 
 
     def save_conf(self):
+        # the tabs in this module write through write_config, so their unchanged configuration is not rewritten
         for tab in self.tabs:
             tab.save_conf()
 
@@ -612,6 +831,16 @@ class Tabs(QTabWidget):
 
 
 class DataTab(QWidget):
+    # alien algorithms in the order of alien_alg choice
+    alien_algs = ('random', 'block_aliens', 'alien_file', 'AutoAlien1')
+    # text parameters loaded from configuration for each alien algorithm, the widget has the parameter name
+    alien_text_params = {'block_aliens': ('aliens',),
+                         'alien_file': ('alien_file',),
+                         'AutoAlien1': ('AA1_size_threshold', 'AA1_asym_threshold', 'AA1_min_pts', 'AA1_eps',
+                                        'AA1_amp_threshold', 'AA1_expandcleanedsigma')}
+    # text parameters loaded from configuration regardless of alien algorithm
+    text_params = ('intensity_threshold', 'binning', 'center_shift', 'adjust_dimensions')
+
     def __init__(self, parent=None):
         """
         Constructor, initializes the tabs.
@@ -641,9 +870,7 @@ class DataTab(QWidget):
         self.alien_alg.addItem("alien file")
         self.alien_alg.addItem("AutoAlien1")
         layout.addRow("alien algorithm", self.alien_alg)
-        sub_layout = QFormLayout()
-        self.set_alien_layout(sub_layout)
-        layout.addRow(sub_layout)
+        self.init_alien_panels(layout)
         self.intensity_threshold = QLineEdit()
         layout.addRow("Intensity Threshold", self.intensity_threshold)
         self.center_shift = QLineEdit()
@@ -661,8 +888,10 @@ class DataTab(QWidget):
         cmd_layout.addWidget(self.config_data_button)
         layout.addRow(cmd_layout)
         self.setLayout(layout)
+        # show the panel after it is parented by the tab
+        self.set_alien_layout()
 
-        self.alien_alg.currentIndexChanged.connect(lambda: self.set_alien_layout(sub_layout))
+        self.alien_alg.currentIndexChanged.connect(self.set_alien_layout)
         # this will create config_data file and run data script
         # to generate data ready for reconstruction
         self.config_data_button.clicked.connect(self.run_tab)
@@ -671,6 +900,12 @@ class DataTab(QWidget):
 
     def clear_conf(self):
         self.alien_alg.setCurrentIndex(0)
+        self.aliens.setText('')
+        self.alien_file.setText('')
+        for widget in (self.AA1_size_threshold, self.AA1_asym_threshold, self.AA1_min_pts, self.AA1_eps,
+                       self.AA1_amp_threshold, self.AA1_expandcleanedsigma):
+            widget.setText('')
+        self.AA1_save_arrs.setChecked(False)
         self.intensity_threshold.setText('')
         self.binning.setText('')
         self.center_shift.setText('')
@@ -688,44 +923,17 @@ class DataTab(QWidget):
         -------
         nothing
         """
-        if 'alien_alg' not in conf_map:
-            conf_map['alien_alg'] = 'random'
-        if conf_map['alien_alg'] == 'random':
-            self.alien_alg.setCurrentIndex(0)
-        elif conf_map['alien_alg'] == 'block_aliens':
-            self.alien_alg.setCurrentIndex(1)
-            if 'aliens' in conf_map:
-                self.aliens.setText(str(conf_map['aliens']).replace(" ", ""))
-        elif conf_map['alien_alg'] == 'alien_file':
-            self.alien_alg.setCurrentIndex(2)
-            if 'alien_file' in conf_map:
-                self.alien_file.setText(str(conf_map['alien_file']).replace(" ", ""))
-        elif conf_map['alien_alg'] == 'AutoAlien1':
-            self.alien_alg.setCurrentIndex(3)
-            if 'AA1_size_threshold' in conf_map:
-                self.AA1_size_threshold.setText(str(conf_map['AA1_size_threshold']).replace(" ", ""))
-            if 'AA1_asym_threshold' in conf_map:
-                self.AA1_asym_threshold.setText(str(conf_map['AA1_asym_threshold']).replace(" ", ""))
-            if 'AA1_min_pts' in conf_map:
-                self.AA1_min_pts.setText(str(conf_map['AA1_min_pts']).replace(" ", ""))
-            if 'AA1_eps' in conf_map:
-                self.AA1_eps.setText(str(conf_map['AA1_eps']).replace(" ", ""))
-            if 'AA1_amp_threshold' in conf_map:
-                self.AA1_amp_threshold.setText(str(conf_map['AA1_amp_threshold']).replace(" ", ""))
-            if 'AA1_save_arrs' in conf_map:
-                self.AA1_save_arrs.setChecked(conf_map['AA1_save_arrs'])
-            else:
-                self.AA1_save_arrs.setChecked(False)
-            if 'AA1_expandcleanedsigma' in conf_map:
-                self.AA1_expandcleanedsigma.setText(str(conf_map['AA1_expandcleanedsigma']).replace(" ", ""))
-        if 'intensity_threshold' in conf_map:
-            self.intensity_threshold.setText(str(conf_map['intensity_threshold']).replace(" ", ""))
-        if 'binning' in conf_map:
-            self.binning.setText(str(conf_map['binning']).replace(" ", ""))
-        if 'center_shift' in conf_map:
-            self.center_shift.setText(str(conf_map['center_shift']).replace(" ", ""))
-        if 'adjust_dimensions' in conf_map:
-            self.adjust_dimensions.setText(str(conf_map['adjust_dimensions']).replace(" ", ""))
+        alien_alg = conf_map.get('alien_alg', 'random')
+        params = self.text_params
+        if alien_alg in self.alien_algs:
+            self.alien_alg.setCurrentIndex(self.alien_algs.index(alien_alg))
+            params = self.alien_text_params.get(alien_alg, ()) + params
+        if alien_alg == 'AutoAlien1':
+            self.AA1_save_arrs.setChecked(conf_map.get('AA1_save_arrs', False))
+        for param in params:
+            value = conf_map.get(param)
+            if value is not None:
+                getattr(self, param).setText(compact(value))
 
 
     def get_data_config(self):
@@ -741,73 +949,88 @@ class DataTab(QWidget):
         """
         conf_map = {}
 
-        if self.alien_alg.currentIndex() == 1:
-            conf_map['alien_alg'] = 'block_aliens'
-            if len(self.aliens.text()) > 0:
-                conf_map['aliens'] = str(self.aliens.text()).replace(os.linesep, '')
-        if self.alien_alg.currentIndex() == 2:
-            conf_map['alien_alg'] = 'alien_file'
-            if len(self.alien_file.text()) > 0:
-                conf_map['alien_file'] = str(self.alien_file.text())
-        elif self.alien_alg.currentIndex() == 3:
-            conf_map['alien_alg'] = 'AutoAlien1'
-            if len(self.AA1_size_threshold.text()) > 0:
-                conf_map['AA1_size_threshold'] = ast.literal_eval(str(self.AA1_size_threshold.text()))
-            if len(self.AA1_asym_threshold.text()) > 0:
-                conf_map['AA1_asym_threshold'] = ast.literal_eval(str(self.AA1_asym_threshold.text()))
-            if len(self.AA1_min_pts.text()) > 0:
-                conf_map['AA1_min_pts'] = ast.literal_eval(str(self.AA1_min_pts.text()))
-            if len(self.AA1_eps.text()) > 0:
-                conf_map['AA1_eps'] = ast.literal_eval(str(self.AA1_eps.text()))
-            if len(self.AA1_amp_threshold.text()) > 0:
-                conf_map['AA1_amp_threshold'] = ast.literal_eval(str(self.AA1_amp_threshold.text()))
-            if self.AA1_save_arrs.isChecked():
-                conf_map['AA1_save_arrs'] = True
-            if len(self.AA1_expandcleanedsigma.text()) > 0:
-                conf_map['AA1_expandcleanedsigma'] = ast.literal_eval(str(self.AA1_expandcleanedsigma.text()))
-
-        if len(self.intensity_threshold.text()) > 0:
-            conf_map['intensity_threshold'] = ast.literal_eval(str(self.intensity_threshold.text()))
-        if len(self.binning.text()) > 0:
-            conf_map['binning'] = ast.literal_eval(str(self.binning.text()).replace(os.linesep, ''))
-        if len(self.center_shift.text()) > 0:
-            conf_map['center_shift'] = ast.literal_eval(str(self.center_shift.text()).replace(os.linesep, ''))
-        if len(self.adjust_dimensions.text()) > 0:
-            conf_map['adjust_dimensions'] = ast.literal_eval(str(self.adjust_dimensions.text()).replace(os.linesep, ''))
+        params = self.text_params
+        # the first choice does not remove aliens and is not saved
+        index = self.alien_alg.currentIndex()
+        if index > 0:
+            alien_alg = self.alien_algs[index]
+            conf_map['alien_alg'] = alien_alg
+            if alien_alg == 'AutoAlien1':
+                if self.AA1_save_arrs.isChecked():
+                    conf_map['AA1_save_arrs'] = True
+                params = self.alien_text_params[alien_alg] + params
+            else:
+                # aliens and alien file are saved as text
+                for param in self.alien_text_params[alien_alg]:
+                    text = getattr(self, param).text()
+                    if text:
+                        conf_map[param] = text
+
+        for param in params:
+            text = getattr(self, param).text()
+            if text:
+                conf_map[param] = com.parse_literal(text)
 
         return conf_map
 
 
-    def set_alien_layout(self, layout):
-        for i in reversed(range(layout.count())):
-            layout.itemAt(i).widget().setParent(None)
-        if self.alien_alg.currentIndex() == 1:
-            self.aliens = QLineEdit()
-            layout.addRow("aliens", self.aliens)
-        elif self.alien_alg.currentIndex() == 2:
-            self.alien_file = QPushButton()
-            layout.addRow("alien file", self.alien_file)
-            self.alien_file.clicked.connect(self.set_alien_file)
-        elif self.alien_alg.currentIndex() == 3:
-            self.AA1_size_threshold = QLineEdit()
-            layout.addRow("relative size threshold", self.AA1_size_threshold)
-            self.AA1_asym_threshold = QLineEdit()
-            layout.addRow("average asymmetry threshold", self.AA1_asym_threshold)
-            self.AA1_min_pts = QLineEdit()
-            layout.addRow("min pts in cluster", self.AA1_min_pts)
-            self.AA1_eps = QLineEdit()
-            layout.addRow("cluster alg eps", self.AA1_eps)
-            self.AA1_amp_threshold = QLineEdit()
-            layout.addRow("alien alg amp threshold", self.AA1_amp_threshold)
-            self.AA1_save_arrs = QCheckBox()
-            layout.addRow("save analysis arrs", self.AA1_save_arrs)
-            self.AA1_save_arrs.setChecked(False)
-            self.AA1_expandcleanedsigma = QLineEdit()
-            layout.addRow("expand cleaned sigma", self.AA1_expandcleanedsigma)
-            self.AA1_default_button = QPushButton('set AutoAlien1 parameters to defaults', self)
-            layout.addWidget(self.AA1_default_button)
-
-            self.AA1_default_button.clicked.connect(self.set_AA1_defaults)
+    def init_alien_panels(self, layout):
+        """
+        Creates panels with parameters for each alien algorithm, ordered as in alien_alg choice. The panels are
+        created once, and only the panel for selected algorithm is shown, see set_alien_layout.
+        Parameters
+        ----------
+        layout : QFormLayout
+            layout the panels are added to
+        Returns
+        -------
+        nothing
+        """
+        # no parameters when aliens are not removed
+        self.alien_panels = [QWidget()]
+
+        block_layout = QFormLayout()
+        self.aliens = QLineEdit()
+        block_layout.addRow("aliens", self.aliens)
+
+        file_layout = QFormLayout()
+        self.alien_file = QPushButton()
+        file_layout.addRow("alien file", self.alien_file)
+        self.alien_file.clicked.connect(self.set_alien_file)
+
+        aa1_layout = QFormLayout()
+        self.AA1_size_threshold = QLineEdit()
+        aa1_layout.addRow("relative size threshold", self.AA1_size_threshold)
+        self.AA1_asym_threshold = QLineEdit()
+        aa1_layout.addRow("average asymmetry threshold", self.AA1_asym_threshold)
+        self.AA1_min_pts = QLineEdit()
+        aa1_layout.addRow("min pts in cluster", self.AA1_min_pts)
+        self.AA1_eps = QLineEdit()
+        aa1_layout.addRow("cluster alg eps", self.AA1_eps)
+        self.AA1_amp_threshold = QLineEdit()
+        aa1_layout.addRow("alien alg amp threshold", self.AA1_amp_threshold)
+        self.AA1_save_arrs = QCheckBox()
+        aa1_layout.addRow("save analysis arrs", self.AA1_save_arrs)
+        self.AA1_save_arrs.setChecked(False)
+        self.AA1_expandcleanedsigma = QLineEdit()
+        aa1_layout.addRow("expand cleaned sigma", self.AA1_expandcleanedsigma)
+        self.AA1_default_button = QPushButton('set AutoAlien1 parameters to defaults', self)
+        aa1_layout.addWidget(self.AA1_default_button)
+        self.AA1_default_button.clicked.connect(self.set_AA1_defaults)
+
+        for panel_layout in (block_layout, file_layout, aa1_layout):
+            panel = QWidget()
+            panel_layout.setContentsMargins(0, 0, 0, 0)
+            panel.setLayout(panel_layout)
+            self.alien_panels.append(panel)
+        for panel in self.alien_panels:
+            layout.addRow(panel)
+
+
+    def set_alien_layout(self):
+        # the hidden panels do not take space in layout
+        for i, panel in enumerate(self.alien_panels):
+            panel.setVisible(i == self.alien_alg.currentIndex())
 
 
     def set_AA1_defaults(self):
@@ -846,48 +1069,45 @@ class DataTab(QWidget):
         """
         import standard_preprocess as run_dt
 
+        self.main_win.flush_save()
         if not self.main_win.is_exp_exists():
             msg_window('the experiment has not been created yet')
         elif not self.main_win.is_exp_set():
             msg_window('the experiment has changed, pres "set experiment" button')
-        elif len(self.intensity_threshold.text()) == 0 and not self.main_win.auto_data:
+        elif len(self.intensity_threshold.text()) == 0 and not self.main_win.auto_data.isChecked():
             msg_window('Please, enter Intensity Threshold parameter')
         else:
-            found_file = False
-            for p, d, f in os.walk(self.main_win.experiment_dir):
-                if 'prep_data.tif' in f:
-                    found_file = True
-                    break
-            if found_file:
+            if find_data_file(self.main_win.experiment_dir, 'preprocessed_data', ('prep_data.tif',)):
                 conf_map = self.get_data_config()
                 # verify that data configuration is ok
-                er_msg = ut.verify('config_data', conf_map)
+                er_msg = verify('config_data', conf_map)
                 if len(er_msg) > 0:
                     msg_window(er_msg)
                     if not self.main_win.no_verify:
                         return
-                ut.write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', 'config_data'))
+                conf_file = ut.join(self.main_win.experiment_dir, 'conf', 'config_data')
+                write_config(conf_map, conf_file)
                 run_dt.format_data(self.main_win.experiment_dir, no_verify=self.main_win.no_verify)
+                # reload the window if auto_data as the intensity_threshold and binning could change,
+                # the file is parsed only if the script rewrote it
+                if self.main_win.auto_data.isChecked():
+                    data_map = read_config(conf_file)
+                    if data_map is not None:
+                        self.load_tab(data_map)
             else:
                 msg_window('Please, run data preparation in previous tab to activate this function')
 
-        # reload the window if auto_data as the intensity_threshold and binning could change
-        main_conf_map = ut.read_config(ut.join(self.main_win.experiment_dir, 'conf', 'config'))
-        if 'auto_data' in main_conf_map and main_conf_map['auto_data']:
-            data_map = ut.read_config(ut.join(self.main_win.experiment_dir, 'conf', 'config_data'))
-            self.load_tab(data_map)
-
 
     def save_conf(self):
         # save data config
         conf_map = self.get_data_config()
         if len(conf_map) > 0:
-            er_msg = ut.verify('config_data', conf_map)
+            er_msg = verify('config_data', conf_map)
             if len(er_msg) > 0:
                 msg_window(er_msg)
                 if not self.main_win.no_verify:
                     return
-            ut.write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', 'config_data'))
+            write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', 'config_data'))
 
 
     def load_data_conf(self):
@@ -902,13 +1122,27 @@ class DataTab(QWidget):
         """
         data_file = select_file(os.getcwd())
         if data_file is not None:
-            conf_map = ut.read_config(data_file.replace(os.sep, '/'))
+            conf_map = read_config(data_file)
             self.load_tab(conf_map)
         else:
             msg_window('please select valid data config file')
 
 
 class RecTab(QWidget):
+    # text fields in order shown: widget attribute, label, parameter, parser, formatter,
+    # and message shown when the text cannot be parsed
+    # TODO add logic to show HIO beta only if HIO is in sequence
+    text_fields = (('device', 'device(s)', 'device', parse_device, compact,
+                    'device parameter should be "all" or a list of int or dict'),
+                   ('reconstructions', 'number of reconstructions', 'reconstructions', com.parse_literal, compact,
+                    'reconstructions parameter should be int'),
+                   ('alg_seq', 'algorithm sequence', 'algorithm_sequence', str.strip, str, None),
+                   ('hio_beta', 'HIO beta', 'hio_beta', com.parse_literal, compact, 'hio_beta parameter should be float'),
+                   ('initial_support_area', 'initial support area', 'initial_support_area', com.parse_literal, compact,
+                    'initial_support_area parameter should be a list of floats'))
+    # initial guess in the order of init_guess choice
+    init_guesses = ('random', 'continue', 'AI_guess')
+
     def __init__(self, parent=None):
         """
         Constructor, initializes the tabs.
@@ -931,6 +1165,8 @@ class RecTab(QWidget):
         self.tabs = tabs
         self.main_win = main_window
         self.old_conf_id = ''
+        # conf directory, its modification time, and rec ids found in it
+        self.rec_ids_cache = None
 
         layout = QVBoxLayout()
         ulayout = QFormLayout()
@@ -942,9 +1178,7 @@ class RecTab(QWidget):
         self.init_guess.addItem("continue")
         self.init_guess.addItem("AI algorithm")
         ulayout.addRow("initial guess", self.init_guess)
-        sub_layout = QFormLayout()
-        self.set_init_guess_layout(sub_layout)
-        ulayout.addRow(sub_layout)
+        self.init_init_guess_panels(ulayout)
 
         self.add_conf_button = QPushButton('add configuration', self)
         ulayout.addWidget(self.add_conf_button)
@@ -960,17 +1194,10 @@ class RecTab(QWidget):
         self.proc.addItem("np")
         self.proc.addItem("torch")
         ulayout.addRow("processor type", self.proc)
-        self.device = QLineEdit()
-        ulayout.addRow("device(s)", self.device)
-        self.reconstructions = QLineEdit()
-        ulayout.addRow("number of reconstructions", self.reconstructions)
-        self.alg_seq = QLineEdit()
-        ulayout.addRow("algorithm sequence", self.alg_seq)
-        # TODO add logic to show this only if HIO is in sequence
-        self.hio_beta = QLineEdit()
-        ulayout.addRow("HIO beta", self.hio_beta)
-        self.initial_support_area = QLineEdit()
-        ulayout.addRow("initial support area", self.initial_support_area)
+        for attr, label, _, _, _, _ in self.text_fields:
+            widget = QLineEdit()
+            setattr(self, attr, widget)
+            ulayout.addRow(label, widget)
         self.rec_default_button = QPushButton('set to defaults', self)
         ulayout.addWidget(self.rec_default_button)
 
@@ -993,9 +1220,11 @@ class RecTab(QWidget):
 
         self.setAutoFillBackground(True)
         self.setLayout(layout)
+        # show the panel after it is parented by the tab
+        self.set_init_guess_layout()
 
         self.config_rec_button.clicked.connect(self.run_tab)
-        self.init_guess.currentIndexChanged.connect(lambda: self.set_init_guess_layout(sub_layout))
+        self.init_guess.currentIndexChanged.connect(self.set_init_guess_layout)
         self.rec_default_button.clicked.connect(self.set_defaults)
         self.add_conf_button.clicked.connect(self.add_rec_conf)
         self.rec_id.currentIndexChanged.connect(self.toggle_conf)
@@ -1003,18 +1232,15 @@ class RecTab(QWidget):
 
 
     def load_tab(self, conf_map, update_rec_choice=True):
-        if 'init_guess' not in conf_map:
-            conf_map['init_guess'] = 'random'
-        if conf_map['init_guess'] == 'random':
-            self.init_guess.setCurrentIndex(0)
-        elif conf_map['init_guess'] == 'continue':
-            self.init_guess.setCurrentIndex(1)
+        init_guess = conf_map.setdefault('init_guess', 'random')
+        if init_guess in self.init_guesses:
+            self.init_guess.setCurrentIndex(self.init_guesses.index(init_guess))
+        if init_guess == 'continue':
             if 'continue_dir' in conf_map:
-                self.cont_dir_button.setText(str(conf_map['continue_dir'].replace(os.sep, '/')).replace(" ", ""))
-        elif conf_map['init_guess'] == 'AI_guess':
-            self.init_guess.setCurrentIndex(2)
+                self.cont_dir_button.setText(compact(com.norm_path(str(conf_map['continue_dir']))))
+        elif init_guess == 'AI_guess':
             if 'AI_trained_model' in conf_map:
-                self.AI_trained_model.setText(str(conf_map['AI_trained_model'].replace(os.sep, '/')).replace(" ", ""))
+                self.AI_trained_model.setText(compact(com.norm_path(str(conf_map['AI_trained_model']))))
                 self.AI_trained_model.setStyleSheet("Text-align:left")
 
         # this will update the configuration choices by reading configuration files names
@@ -1025,35 +1251,26 @@ class RecTab(QWidget):
 
         if 'processing' in conf_map:
             self.proc.setCurrentText(str(conf_map['processing']))
-        if 'device' in conf_map:
-            self.device.setText(str(conf_map['device']).replace(" ", ""))
-        if 'reconstructions' in conf_map:
-            self.reconstructions.setText(str(conf_map['reconstructions']).replace(" ", ""))
-        if 'algorithm_sequence' in conf_map:
-            self.alg_seq.setText(str(conf_map['algorithm_sequence']))
-        if 'hio_beta' in conf_map:
-            self.hio_beta.setText(str(conf_map['hio_beta']).replace(" ", ""))
-        if 'initial_support_area' in conf_map:
-            self.initial_support_area.setText(str(conf_map['initial_support_area']).replace(" ", ""))
+        for attr, _, param, _, show, _ in self.text_fields:
+            if param in conf_map:
+                getattr(self, attr).setText(show(conf_map[param]))
 
-        for feat_id in self.features.feature_dir:
-            self.features.feature_dir[feat_id].init_config(conf_map)
+        self.features.init_config(conf_map)
 
         self.notify()
 
 
     def clear_conf(self):
         self.init_guess.setCurrentIndex(0)
+        self.cont_dir_button.setText('')
+        self.AI_trained_model.setText('')
         nu_to_remove = self.rec_id.count() - 1
         for _ in range(nu_to_remove):
             self.rec_id.removeItem(1)
         self.old_conf_id = ''
-        self.device.setText('')
         self.proc.setCurrentIndex(0)
-        self.reconstructions.setText('')
-        self.alg_seq.setText('')
-        self.hio_beta.setText('')
-        self.initial_support_area.setText('')
+        for attr, _, _, _, _, _ in self.text_fields:
+            getattr(self, attr).setText('')
         for feat_id in self.features.feature_dir:
             self.features.feature_dir[feat_id].active.setChecked(False)
 
@@ -1070,46 +1287,28 @@ class RecTab(QWidget):
             contains parameters read from window
         """
         conf_map = {}
-        if len(self.reconstructions.text()) > 0:
-            try:
-                conf_map['reconstructions'] = ast.literal_eval(self.reconstructions.text())
-            except:
-                msg_window('reconstructions parameter should be int')
-                return {}
         if len(self.proc.currentText()) > 0:
             conf_map['processing'] = str(self.proc.currentText())
-        if len(self.device.text()) > 0:
-            try:
-                d = str(self.device.text()).replace(os.linesep,'')
-                if d == 'all':
-                    conf_map['device'] = d
-                else:
-                    conf_map['device'] = ast.literal_eval(d)
-            except:
-                msg_window('device parameter should be "all" or a list of int or dict')
-                return {}
-        if len(self.alg_seq.text()) > 0:
-            conf_map['algorithm_sequence'] = str(self.alg_seq.text()).strip()
-        if len(self.hio_beta.text()) > 0:
-            try:
-                conf_map['hio_beta'] = ast.literal_eval(str(self.hio_beta.text()))
-            except:
-                msg_window('hio_beta parameter should be float')
-                return {}
-        if len(self.initial_support_area.text()) > 0:
-            try:
-                conf_map['initial_support_area'] = ast.literal_eval(str(self.initial_support_area.text()).replace(os.linesep,''))
-            except:
-                msg_window('initial_support_area parameter should be a list of floats')
-                return {}
-        if self.init_guess.currentIndex() == 1:
-            conf_map['init_guess'] = 'continue'
-            if len(self.cont_dir_button.text().strip()) > 0:
-                conf_map['continue_dir'] = str(self.cont_dir_button.text()).replace(os.sep, '/').strip()
-        elif self.init_guess.currentIndex() == 2:
-            conf_map['init_guess'] = 'AI_guess'
-            if len(self.AI_trained_model.text()) > 0:
-                conf_map['AI_trained_model'] = str(self.AI_trained_model.text()).replace(os.sep, '/').strip()
+        for attr, _, param, parse, _, er_msg in self.text_fields:
+            text = getattr(self, attr).text()
+            if text:
+                try:
+                    conf_map[param] = parse(text)
+                except Exception:
+                    msg_window(er_msg)
+                    return {}
+        # random initial guess is default, and is not saved
+        init_guess = self.init_guesses[self.init_guess.currentIndex()]
+        if init_guess == 'continue':
+            conf_map['init_guess'] = init_guess
+            text = self.cont_dir_button.text().strip()
+            if text:
+                conf_map['continue_dir'] = com.norm_path(text)
+        elif init_guess == 'AI_guess':
+            conf_map['init_guess'] = init_guess
+            text = self.AI_trained_model.text()
+            if text:
+                conf_map['AI_trained_model'] = com.norm_path(text).strip()
         for feat_id in self.features.feature_dir:
             self.features.feature_dir[feat_id].add_config(conf_map)
 
@@ -1121,20 +1320,47 @@ class RecTab(QWidget):
         if len(conf_map) == 0:
             return
 
-        ut.write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', 'config_rec'))
+        write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', 'config_rec'))
 
 
-    def set_init_guess_layout(self, layout):
-        for i in reversed(range(layout.count())):
-            layout.itemAt(i).widget().setParent(None)
-        if self.init_guess.currentIndex() == 1:
-            self.cont_dir_button = QPushButton()
-            layout.addRow("continue directory", self.cont_dir_button)
-            self.cont_dir_button.clicked.connect(self.set_cont_dir)
-        elif self.init_guess.currentIndex() == 2:
-            self.AI_trained_model = QPushButton()
-            layout.addRow("AI trained model file", self.AI_trained_model)
-            self.AI_trained_model.clicked.connect(self.set_aitm_file)
+    def init_init_guess_panels(self, layout):
+        """
+        Creates panels with parameters for each initial guess choice, ordered as in init_guess choice. The panels
+        are created once, and only the panel for selected choice is shown, see set_init_guess_layout.
+        Parameters
+        ----------
+        layout : QFormLayout
+            layout the panels are added to
+        Returns
+        -------
+        nothing
+        """
+        # no parameters for random guess
+        self.init_guess_panels = [QWidget()]
+
+        cont_layout = QFormLayout()
+        self.cont_dir_button = QPushButton()
+        cont_layout.addRow("continue directory", self.cont_dir_button)
+        self.cont_dir_button.clicked.connect(self.set_cont_dir)
+
+        ai_layout = QFormLayout()
+        self.AI_trained_model = QPushButton()
+        ai_layout.addRow("AI trained model file", self.AI_trained_model)
+        self.AI_trained_model.clicked.connect(self.set_aitm_file)
+
+        for panel_layout in (cont_layout, ai_layout):
+            panel = QWidget()
+            panel_layout.setContentsMargins(0, 0, 0, 0)
+            panel.setLayout(panel_layout)
+            self.init_guess_panels.append(panel)
+        for panel in self.init_guess_panels:
+            layout.addRow(panel)
+
+
+    def set_init_guess_layout(self):
+        # the hidden panels do not take space in layout
+        for i, panel in enumerate(self.init_guess_panels):
+            panel.setVisible(i == self.init_guess.currentIndex())
 
 
     def set_cont_dir(self):
@@ -1147,7 +1373,7 @@ class RecTab(QWidget):
         -------
         nothing
         """
-        cont_dir = select_dir(os.getcwd().replace(os.sep, '/')).replace(os.sep, '/')
+        cont_dir = select_dir(os.getcwd())
         if cont_dir is not None:
             self.cont_dir_button.setStyleSheet("Text-align:left")
             self.cont_dir_button.setText(cont_dir)
@@ -1156,7 +1382,7 @@ class RecTab(QWidget):
 
 
     def set_aitm_file(self):
-        AI_trained_model = select_file(os.getcwd().replace(os.sep, '/')).replace(os.sep, '/')
+        AI_trained_model = select_file(os.getcwd())
         if AI_trained_model is not None:
             self.AI_trained_model.setStyleSheet("Text-align:left")
             self.AI_trained_model.setText(AI_trained_model)
@@ -1169,20 +1395,21 @@ class RecTab(QWidget):
         if id in self.rec_ids:
             msg_window(f'the {id} is alredy used')
             return
-        if ok and len(id) > 0:
-            if len(self.rec_ids) > 1:
-                self.rec_id.addItem(id)
-            else:
-                self.rec_id.show()
-                self.rec_id.addItem(id)
-        else:
+        if not ok or len(id) == 0:
             return
 
         # copy the config_rec into <id>_config_rec
-
         conf_file = ut.join(self.main_win.experiment_dir, 'conf', 'config_rec')
         new_conf_file = ut.join(self.main_win.experiment_dir, 'conf', f'config_rec_{id}')
-        shutil.copyfile(conf_file, new_conf_file)
+        conf_map = read_config(conf_file)
+        if conf_map is None:
+            msg_window(f'please check configuration file {conf_file}')
+            return
+        write_config(conf_map, new_conf_file)
+
+        if len(self.rec_ids) <= 1:
+            self.rec_id.show()
+        self.rec_id.addItem(id)
         self.rec_id.setCurrentIndex(self.rec_id.count() - 1)
 
 
@@ -1212,7 +1439,8 @@ class RecTab(QWidget):
             return
         conf_dir = ut.join(self.main_win.experiment_dir, 'conf')
 
-        ut.write_config(conf_map, ut.join(conf_dir, conf_file))
+        # the outgoing configuration is written at once, unchanged configuration is not rewritten
+        write_config(conf_map, ut.join(conf_dir, conf_file))
         if str(self.rec_id.currentText()) == 'main':
             self.old_conf_id = ''
         else:
@@ -1224,7 +1452,7 @@ class RecTab(QWidget):
         else:
             conf_file = ut.join(conf_dir, f'config_rec_{self.old_conf_id}')
 
-        conf_map = ut.read_config(conf_file)
+        conf_map = read_config(conf_file)
         if conf_map is None:
             msg_window(f'please check configuration file {conf_file}')
             return
@@ -1244,7 +1472,7 @@ class RecTab(QWidget):
         """
         rec_file = select_file(os.getcwd())
         if rec_file is not None:
-            conf_map = ut.read_config(rec_file.replace(os.sep, '/'))
+            conf_map = read_config(rec_file)
             if conf_map is None:
                 msg_window(f'please check configuration file {rec_file}')
                 return
@@ -1266,20 +1494,13 @@ class RecTab(QWidget):
         """
         import run_reconstruction as run_rc
 
+        self.main_win.flush_save()
         if not self.main_win.is_exp_exists():
             msg_window('the experiment has not been created yet')
         elif not self.main_win.is_exp_set():
             msg_window('the experiment has changed, pres "set experiment" button')
         else:
-            found_file = False
-            for p, d, f in os.walk(self.main_win.experiment_dir):
-                if 'data.tif' in f:
-                    found_file = True
-                    break
-                if 'data.npy' in f:
-                    found_file = True
-                    break
-            if found_file:
+            if find_data_file(self.main_win.experiment_dir, 'phasing_data', ('data.tif', 'data.npy')):
                 # find out which configuration should be saved
                 if self.old_conf_id == '':
                     conf_file = 'config_rec'
@@ -1293,12 +1514,12 @@ class RecTab(QWidget):
                     return
 
                 # verify that reconstruction configuration is ok
-                er_msg = ut.verify('config_rec', conf_map)
+                er_msg = verify('config_rec', conf_map)
                 if len(er_msg) > 0:
                     msg_window(er_msg)
                     if not self.main_win.no_verify:
                         return
-                ut.write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', conf_file))
+                write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', conf_file))
                 run_rc.manage_reconstruction(self.main_win.experiment_dir, config_id=conf_id, no_verify=self.main_win.no_verify)
                 self.notify()
             else:
@@ -1341,9 +1562,14 @@ class RecTab(QWidget):
         # fill out the config_id choice bar by reading configuration files names
         if not self.main_win.is_exp_set():
             return
-        for file in os.listdir(ut.join(self.main_win.experiment_dir, 'conf')):
-            if file.startswith('config_rec_'):
-                self.rec_ids.append(file[len('config_rec_') : len(file)])
+        conf_dir = ut.join(self.main_win.experiment_dir, 'conf')
+        mtime = os.stat(conf_dir).st_mtime_ns
+        # the directory is listed again only when files were added or removed
+        if self.rec_ids_cache is None or self.rec_ids_cache[:2] != (conf_dir, mtime):
+            with os.scandir(conf_dir) as entries:
+                rec_ids = [entry.name[len(REC_PREFIX):] for entry in entries if entry.name.startswith(REC_PREFIX)]
+            self.rec_ids_cache = (conf_dir, mtime, rec_ids)
+        self.rec_ids.extend(self.rec_ids_cache[2])
         if len(self.rec_ids) > 0:
             self.rec_id.addItems(self.rec_ids)
             self.rec_id.show()
@@ -1357,6 +1583,11 @@ class Feature(object):
     """
     This is a parent class to concrete feature classes.
     """
+    # widgets are kept in slots, concrete class lists the parameter widgets it creates
+    __slots__ = ('id', 'stack', 'active', 'params', 'default_button', '__weakref__')
+    # parameters parsed from text fields, with widget attribute holding the text, set in concrete class
+    literal_params = ()
+
     def __init__(self):
         """
         Constructor, each feature object contains QWidget.
@@ -1368,6 +1599,8 @@ class Feature(object):
         nothing
         """
         self.stack = QWidget()
+        # panel with parameters, created when the feature is first activated
+        self.params = None
 
 
     def stackUI(self, item, feats):
@@ -1405,26 +1638,55 @@ class Feature(object):
         nothing
         """
         if self.active.isChecked():
-            self.fill_active(layout)
-
-            self.default_button = QPushButton('set to defaults', feats)
-            layout.addWidget(self.default_button)
-            self.default_button.clicked.connect(self.rec_default)
-
+            if self.params is None:
+                self.init_params(layout, feats)
+            self.params.show()
             item.setForeground(QColor('black'));
         else:
             self.clear_params(layout, item)
 
 
+    def init_params(self, layout, feats):
+        """
+        Creates panel with the feature's parameters and adds it below the 'active' checkbox. The panel is kept
+        when the feature is deactivated, and is shown again when the feature is activated.
+        Parameters
+        ----------
+        layout : Layout widget
+            a layout with the feature
+        feats : Features object
+            Features object is a composition of features
+        Returns
+        -------
+        nothing
+        """
+        params_layout = QFormLayout()
+        params_layout.setContentsMargins(0, 0, 0, 0)
+        self.fill_active(params_layout)
+
+        self.default_button = QPushButton('set to defaults', feats)
+        params_layout.addWidget(self.default_button)
+        self.default_button.clicked.connect(self.rec_default)
+
+        self.params = QWidget()
+        self.params.setLayout(params_layout)
+        layout.addRow(self.params)
+
+
     def clear_params(self, layout, item):
-        for i in reversed(range(1, layout.count())):
-            layout.itemAt(i).widget().setParent(None)
+        # the panel is hidden, and its fields are cleared, so they are empty when the feature is activated again
+        if self.params is not None:
+            self.params.hide()
+            for widget in self.params.findChildren(QLineEdit):
+                widget.setText('')
+            for widget in self.params.findChildren(QCheckBox):
+                widget.setChecked(False)
         item.setForeground(QColor('grey'));
 
 
     def fill_active(self, layout):
         """
-        This function is overriden in concrete class. It displays the feature's parameters when the feature becomes active.
+        This function is overriden in concrete class. It creates the feature's parameters when the feature is first activated.
         Parameters
         ----------
         layout : Layout widget
@@ -1466,7 +1728,8 @@ class Feature(object):
 
     def add_feat_conf(self, conf_map):
         """
-        This function is overriden in concrete class. It adds feature's parameters to dictionary.
+        This function adds feature's parameters parsed from text fields to dictionary. It is extended in concrete
+        class for parameters that need other handling.
         Parameters
         ----------
         conf_map : dict
@@ -1475,7 +1738,10 @@ class Feature(object):
         -------
         nothing
         """
-        pass
+        for param, attr in self.literal_params:
+            text = getattr(self, attr).text()
+            if text:
+                conf_map[param] = com.parse_literal(text)
 
 
     def init_config(self, conf_map):
@@ -1496,6 +1762,17 @@ class GA(Feature):
     """
     This class encapsulates GA feature.
     """
+    __slots__ = ('ga_fast', 'generations', 'metrics', 'breed_modes', 'removes', 'ga_sw_thresholds',
+                 'ga_sw_gauss_sigmas', 'lr_sigmas', 'gen_pc_start')
+    literal_params = (('ga_generations', 'generations'),
+                      ('ga_metrics', 'metrics'),
+                      ('ga_breed_modes', 'breed_modes'),
+                      ('ga_cullings', 'removes'),
+                      ('ga_sw_thresholds', 'ga_sw_thresholds'),
+                      ('ga_sw_gauss_sigmas', 'ga_sw_gauss_sigmas'),
+                      ('ga_lpf_sigmas', 'lr_sigmas'),
+                      ('ga_gen_pc_start', 'gen_pc_start'))
+
     def __init__(self):
         super(GA, self).__init__()
         self.id = 'GA'
@@ -1519,46 +1796,20 @@ class GA(Feature):
         if 'ga_generations' in conf_map:
             gens = conf_map['ga_generations']
             self.active.setChecked(True)
-            self.generations.setText(str(gens).replace(" ", ""))
+            self.generations.setText(compact(gens))
         else:
             self.active.setChecked(False)
             return
-        if 'ga_fast' in conf_map:
-            ga_fast = conf_map['ga_fast']
-            if ga_fast:
-                self.ga_fast.setChecked(True)
-            else:
-                self.ga_fast.setChecked(False)
-        else:
-            self.ga_fast.setChecked(False)
-        if 'ga_metrics' in conf_map:
-            self.metrics.setText(str(conf_map['ga_metrics']).replace(" ", ""))
-        else:
-            self.metrics.setText('')
-        if 'ga_breed_modes' in conf_map:
-            self.breed_modes.setText(str(conf_map['ga_breed_modes']).replace(" ", ""))
-        else:
-            self.breed_modes.setText('')
-        if 'ga_cullings' in conf_map:
-            self.removes.setText(str(conf_map['ga_cullings']).replace(" ", ""))
-        else:
-            self.removes.setText('')
-        if 'ga_sw_thresholds' in conf_map:
-            self.ga_sw_thresholds.setText(str(conf_map['ga_sw_thresholds']).replace(" ", ""))
-        else:
-            self.ga_sw_thresholds.setText('')
-        if 'ga_sw_gauss_sigmas' in conf_map:
-            self.ga_sw_gauss_sigmas.setText(str(conf_map['ga_sw_gauss_sigmas']).replace(" ", ""))
-        else:
-            self.ga_sw_gauss_sigmas.setText('')
-        if 'ga_lpf_sigmas' in conf_map:
-            self.lr_sigmas.setText(str(conf_map['ga_lpf_sigmas']).replace(" ", ""))
-        else:
-            self.lr_sigmas.setText('')
-        if 'ga_gen_pc_start' in conf_map:
-            self.gen_pc_start.setText(str(conf_map['ga_gen_pc_start']).replace(" ", ""))
-        else:
-            self.gen_pc_start.setText('')
+        self.ga_fast.setChecked(bool(conf_map.get('ga_fast', False)))
+        fields = (('ga_metrics', self.metrics),
+                  ('ga_breed_modes', self.breed_modes),
+                  ('ga_cullings', self.removes),
+                  ('ga_sw_thresholds', self.ga_sw_thresholds),
+                  ('ga_sw_gauss_sigmas', self.ga_sw_gauss_sigmas),
+                  ('ga_lpf_sigmas', self.lr_sigmas),
+                  ('ga_gen_pc_start', self.gen_pc_start))
+        for key, widget in fields:
+            widget.setText(compact(conf_map[key]) if key in conf_map else '')
 
 
     def fill_active(self, layout):
@@ -1623,30 +1874,20 @@ class GA(Feature):
         -------
         nothing
         """
+        super(GA, self).add_feat_conf(conf_map)
         if self.ga_fast.isChecked():
             conf_map['ga_fast'] = True
-        if len(self.generations.text()) > 0:
-            conf_map['ga_generations'] = ast.literal_eval(str(self.generations.text()))
-        if len(self.metrics.text()) > 0:
-         conf_map['ga_metrics'] = ast.literal_eval(str(self.metrics.text()).replace(os.linesep,''))
-        if len(self.breed_modes.text()) > 0:
-          conf_map['ga_breed_modes'] = ast.literal_eval(str(self.breed_modes.text()).replace(os.linesep,''))
-        if len(self.removes.text()) > 0:
-           conf_map['ga_cullings'] = ast.literal_eval(str(self.removes.text()).replace(os.linesep,''))
-        if len(self.ga_sw_thresholds.text()) > 0:
-            conf_map['ga_sw_thresholds'] = ast.literal_eval(str(self.ga_sw_thresholds.text()).replace(os.linesep,''))
-        if len(self.ga_sw_gauss_sigmas.text()) > 0:
-            conf_map['ga_sw_gauss_sigmas'] = ast.literal_eval(str(self.ga_sw_gauss_sigmas.text()).replace(os.linesep,''))
-        if len(self.lr_sigmas.text()) > 0:
-            conf_map['ga_lpf_sigmas'] = ast.literal_eval(str(self.lr_sigmas.text()).replace(os.linesep,''))
-        if len(self.gen_pc_start.text()) > 0:
-            conf_map['ga_gen_pc_start'] = ast.literal_eval(str(self.gen_pc_start.text()))
 
 
 class low_resolution(Feature):
     """
     This class encapsulates low resolution feature.
     """
+    __slots__ = ('lpf_triggers', 'lpf_sw_threshold', 'lpf_range')
+    literal_params = (('lowpass_filter_trigger', 'lpf_triggers'),
+                      ('lowpass_filter_sw_threshold', 'lpf_sw_threshold'),
+                      ('lowpass_filter_range', 'lpf_range'))
+
     def __init__(self):
         super(low_resolution, self).__init__()
         self.id = 'low resolution'
@@ -1666,16 +1907,16 @@ class low_resolution(Feature):
         if 'lowpass_filter_trigger' in conf_map:
             triggers = conf_map['lowpass_filter_trigger']
             self.active.setChecked(True)
-            self.lpf_triggers.setText(str(triggers).replace(" ", ""))
+            self.lpf_triggers.setText(compact(triggers))
         else:
             self.active.setChecked(False)
             return
         if 'lowpass_filter_sw_threshold' in conf_map:
-            self.lpf_sw_threshold.setText(str(conf_map['lowpass_filter_sw_threshold']).replace(" ", ""))
+            self.lpf_sw_threshold.setText(compact(conf_map['lowpass_filter_sw_threshold']))
         else:
             self.lpf_sw_threshold.setText('')
         if 'lowpass_filter_range' in conf_map:
-            self.lpf_range.setText(str(conf_map['lowpass_filter_range']).replace(" ", ""))
+            self.lpf_range.setText(compact(conf_map['lowpass_filter_range']))
         else:
             self.lpf_range.setText('')
 
@@ -1715,29 +1956,15 @@ class low_resolution(Feature):
         self.lpf_range.setText('[.7]')
 
 
-    def add_feat_conf(self, conf_map):
-        """
-        This function adds low resolution feature's parameters to dictionary.
-        Parameters
-        ----------
-        conf_map : dict
-            contains parameters for reconstruction
-        Returns
-        -------
-        nothing
-        """
-        if len(self.lpf_triggers.text()) > 0:
-            conf_map['lowpass_filter_trigger'] = ast.literal_eval(str(self.lpf_triggers.text()).replace(os.linesep, ''))
-        if len(self.lpf_sw_threshold.text()) > 0:
-            conf_map['lowpass_filter_sw_threshold'] = ast.literal_eval(str(self.lpf_sw_threshold.text()).replace(os.linesep, ''))
-        if len(self.lpf_range.text()) > 0:
-            conf_map['lowpass_filter_range'] = ast.literal_eval(str(self.lpf_range.text()).replace(os.linesep, ''))
-
-
 class shrink_wrap(Feature):
     """
     This class encapsulates support feature.
     """
+    __slots__ = ('shrink_wrap_triggers', 'shrink_wrap_type', 'shrink_wrap_threshold', 'shrink_wrap_gauss_sigma')
+    literal_params = (('shrink_wrap_trigger', 'shrink_wrap_triggers'),
+                      ('shrink_wrap_threshold', 'shrink_wrap_threshold'),
+                      ('shrink_wrap_gauss_sigma', 'shrink_wrap_gauss_sigma'))
+
     def __init__(self):
         super(shrink_wrap, self).__init__()
         self.id = 'shrink wrap'
@@ -1757,20 +1984,20 @@ class shrink_wrap(Feature):
         if 'shrink_wrap_trigger' in conf_map:
             triggers = conf_map['shrink_wrap_trigger']
             self.active.setChecked(True)
-            self.shrink_wrap_triggers.setText(str(triggers).replace(" ", ""))
+            self.shrink_wrap_triggers.setText(compact(triggers))
         else:
             self.active.setChecked(False)
             return
         if 'shrink_wrap_type' in conf_map:
-            self.shrink_wrap_type.setText(str(conf_map['shrink_wrap_type']).replace(" ", ""))
+            self.shrink_wrap_type.setText(compact(conf_map['shrink_wrap_type']))
         else:
             self.shrink_wrap_type.setText('')
         if 'shrink_wrap_threshold' in conf_map:
-            self.shrink_wrap_threshold.setText(str(conf_map['shrink_wrap_threshold']).replace(" ", ""))
+            self.shrink_wrap_threshold.setText(compact(conf_map['shrink_wrap_threshold']))
         else:
             self.shrink_wrap_threshold.setText('')
         if 'shrink_wrap_gauss_sigma' in conf_map:
-            self.shrink_wrap_gauss_sigma.setText(str(conf_map['shrink_wrap_gauss_sigma']).replace(" ", ""))
+            self.shrink_wrap_gauss_sigma.setText(compact(conf_map['shrink_wrap_gauss_sigma']))
         else:
             self.shrink_wrap_gauss_sigma.setText('')
 
@@ -1823,29 +2050,30 @@ class shrink_wrap(Feature):
         -------
         nothing
         """
-        if len(self.shrink_wrap_triggers.text()) > 0:
-            conf_map['shrink_wrap_trigger'] = ast.literal_eval(str(self.shrink_wrap_triggers.text()).replace(os.linesep,''))
-        if len(self.shrink_wrap_type.text()) > 0:
-            sw_type = str(self.shrink_wrap_type.text()).replace(' ','')
+        super(shrink_wrap, self).add_feat_conf(conf_map)
+        sw_type = self.shrink_wrap_type.text().replace(' ', '')
+        if len(sw_type) > 0:
             # in case of multiple shrink wraps the shrink_wrap_type is a list of strings
             if sw_type.startswith('['):
-                if sw_type.startswith('["') or sw_type.startswith(("['")):
-                    conf_map['shrink_wrap_type'] = ast.literal_eval(sw_type)
-                else: # parse as one string
-                    sw_type = sw_type.replace('[', '["').replace(',', '","').replace(']', '"]')
+                if not sw_type.endswith(']'):
+                    msg_window('shrink_wrap_type parameter should be a string or a list of strings')
+                elif sw_type.startswith('["') or sw_type.startswith(("['")):
                     conf_map['shrink_wrap_type'] = ast.literal_eval(sw_type)
+                else: # names are not quoted, split the list
+                    conf_map['shrink_wrap_type'] = [t for t in sw_type[1:-1].split(',') if len(t) > 0]
             else:
                 conf_map['shrink_wrap_type'] = sw_type
-        if len(self.shrink_wrap_threshold.text()) > 0:
-            conf_map['shrink_wrap_threshold'] = ast.literal_eval(str(self.shrink_wrap_threshold.text()))
-        if len(self.shrink_wrap_gauss_sigma.text()) > 0:
-            conf_map['shrink_wrap_gauss_sigma'] = ast.literal_eval(str(self.shrink_wrap_gauss_sigma.text()))
 
 
 class phase_constrain(Feature):
     """
     This class encapsulates phase constrain feature.
     """
+    __slots__ = ('phase_triggers', 'phc_phase_min', 'phc_phase_max')
+    literal_params = (('phc_trigger', 'phase_triggers'),
+                      ('phc_phase_min', 'phc_phase_min'),
+                      ('phc_phase_max', 'phc_phase_max'))
+
     def __init__(self):
         super(phase_constrain, self).__init__()
         self.id = 'phase constrain'
@@ -1865,16 +2093,16 @@ class phase_constrain(Feature):
         if 'phc_trigger' in conf_map:
             triggers = conf_map['phc_trigger']
             self.active.setChecked(True)
-            self.phase_triggers.setText(str(triggers).replace(" ", ""))
+            self.phase_triggers.setText(compact(triggers))
         else:
             self.active.setChecked(False)
             return
         if 'phc_phase_min' in conf_map:
-            self.phc_phase_min.setText(str(conf_map['phc_phase_min']).replace(" ", ""))
+            self.phc_phase_min.setText(compact(conf_map['phc_phase_min']))
         else:
             self.phc_phase_min.setText('')
         if 'phc_phase_max' in conf_map:
-            self.phc_phase_max.setText(str(conf_map['phc_phase_max']).replace(" ", ""))
+            self.phc_phase_max.setText(compact(conf_map['phc_phase_max']))
         else:
             self.phc_phase_max.setText('')
 
@@ -1914,29 +2142,15 @@ class phase_constrain(Feature):
         self.phc_phase_max.setText('1.57')
 
 
-    def add_feat_conf(self, conf_map):
-        """
-        This function adds phase constrain feature's parameters to dictionary.
-        Parameters
-        ----------
-        conf_map : dict
-            contains parameters for reconstruction
-        Returns
-        -------
-        nothing
-        """
-        if len(self.phase_triggers.text()) > 0:
-            conf_map['phc_trigger'] = ast.literal_eval(str(self.phase_triggers.text()).replace(os.linesep,''))
-        if len(self.phc_phase_min.text()) > 0:
-            conf_map['phc_phase_min'] = ast.literal_eval(str(self.phc_phase_min.text()))
-        if len(self.phc_phase_max.text()) > 0:
-            conf_map['phc_phase_max'] = ast.literal_eval(str(self.phc_phase_max.text()))
-
-
 class pcdi(Feature):
     """
     This class encapsulates pcdi feature.
     """
+    __slots__ = ('pc_interval', 'pc_type', 'pc_iter', 'pc_normalize', 'pc_LUCY_kernel')
+    literal_params = (('pc_interval', 'pc_interval'),
+                      ('pc_LUCY_iterations', 'pc_iter'),
+                      ('pc_LUCY_kernel', 'pc_LUCY_kernel'))
+
     def __init__(self):
         super(pcdi, self).__init__()
         self.id = 'pcdi'
@@ -1955,24 +2169,24 @@ class pcdi(Feature):
         """
         if 'pc_interval' in conf_map:
             self.active.setChecked(True)
-            self.pc_interval.setText(str(conf_map['pc_interval']).replace(" ", ""))
+            self.pc_interval.setText(compact(conf_map['pc_interval']))
         else:
             self.active.setChecked(False)
             return
         if 'pc_type' in conf_map:
-            self.pc_type.setText(str(conf_map['pc_type']).replace(" ", ""))
+            self.pc_type.setText(compact(conf_map['pc_type']))
         else:
             self.pc_type.setText('')
         if 'pc_LUCY_iterations' in conf_map:
-            self.pc_iter.setText(str(conf_map['pc_LUCY_iterations']).replace(" ", ""))
+            self.pc_iter.setText(compact(conf_map['pc_LUCY_iterations']))
         else:
             self.pc_iter.setText('')
         if 'pc_normalize' in conf_map:
-            self.pc_normalize.setText(str(conf_map['pc_normalize']).replace(" ", ""))
+            self.pc_normalize.setText(compact(conf_map['pc_normalize']))
         else:
             self.pc_normalize.setText('')
         if 'pc_LUCY_kernel' in conf_map:
-            self.pc_LUCY_kernel.setText(str(conf_map['pc_LUCY_kernel']).replace(" ", ""))
+            self.pc_LUCY_kernel.setText(compact(conf_map['pc_LUCY_kernel']))
         else:
             self.pc_LUCY_kernel.setText('')
 
@@ -2028,25 +2242,25 @@ class pcdi(Feature):
         -------
         nothing
         """
-        if len(self.pc_interval.text()) > 0:
-            conf_map['pc_interval'] = ast.literal_eval(str(self.pc_interval.text()))
-        if len(self.pc_type.text()) > 0:
-            conf_map['pc_type'] = str(self.pc_type.text())
-        if len(self.pc_iter.text()) > 0:
-            conf_map['pc_LUCY_iterations'] = ast.literal_eval(str(self.pc_iter.text()))
-        pc_normalize_txt = str(self.pc_normalize.text()).strip()
+        super(pcdi, self).add_feat_conf(conf_map)
+        pc_type = self.pc_type.text()
+        if len(pc_type) > 0:
+            conf_map['pc_type'] = pc_type
+        pc_normalize_txt = self.pc_normalize.text().strip()
         if pc_normalize_txt == 'False':
             conf_map['pc_normalize'] = False
         else:
             conf_map['pc_normalize'] = True
-        if len(self.pc_LUCY_kernel.text()) > 0:
-            conf_map['pc_LUCY_kernel'] = ast.literal_eval(str(self.pc_LUCY_kernel.text()).replace(os.linesep,''))
 
 
 class twin(Feature):
     """
     This class encapsulates twin feature.
     """
+    __slots__ = ('twin_triggers', 'twin_halves')
+    literal_params = (('twin_trigger', 'twin_triggers'),
+                      ('twin_halves', 'twin_halves'))
+
     def __init__(self):
         super(twin, self).__init__()
         self.id = 'twin'
@@ -2065,12 +2279,12 @@ class twin(Feature):
         """
         if 'twin_trigger' in conf_map:
             self.active.setChecked(True)
-            self.twin_triggers.setText(str(conf_map['twin_trigger']).replace(" ", ""))
+            self.twin_triggers.setText(compact(conf_map['twin_trigger']))
         else:
             self.active.setChecked(False)
             return
         if 'twin_halves' in conf_map:
-            self.twin_halves.setText(str(conf_map['twin_halves']).replace(" ", ""))
+            self.twin_halves.setText(compact(conf_map['twin_halves']))
         else:
             self.twin_halves.setText('')
 
@@ -2106,27 +2320,13 @@ class twin(Feature):
         self.twin_halves.setText('[0,0]')
 
 
-    def add_feat_conf(self, conf_map):
-        """
-        This function adds twin feature's parameters to dictionary.
-        Parameters
-        ----------
-        conf_map : dict
-            contains parameters for reconstruction
-        Returns
-        -------
-        nothing
-        """
-        if len(self.twin_triggers.text()) > 0:
-            conf_map['twin_trigger'] = ast.literal_eval(str(self.twin_triggers.text()).replace(os.linesep,''))
-        if len(self.twin_halves.text()) > 0:
-            conf_map['twin_halves'] = ast.literal_eval(str(self.twin_halves.text()).replace(os.linesep,''))
-
-
 class average(Feature):
     """
     This class encapsulates average feature.
     """
+    __slots__ = ('average_triggers',)
+    literal_params = (('average_trigger', 'average_triggers'),)
+
     def __init__(self):
         super(average, self).__init__()
         self.id = 'average'
@@ -2145,7 +2345,7 @@ class average(Feature):
         """
         if 'average_trigger' in conf_map:
             self.active.setChecked(True)
-            self.average_triggers.setText(str(conf_map['average_trigger']).replace(" ", ""))
+            self.average_triggers.setText(compact(conf_map['average_trigger']))
         else:
             self.active.setChecked(False)
             return
@@ -2179,24 +2379,13 @@ class average(Feature):
         self.average_triggers.setText('[-50,1]')
 
 
-    def add_feat_conf(self, conf_map):
-        """
-        This function adds average feature's parameters to dictionary.
-        Parameters
-        ----------
-        conf_map : dict
-            contains parameters for reconstruction
-        Returns
-        -------
-        nothing
-        """
-        conf_map['average_trigger'] = ast.literal_eval(str(self.average_triggers.text()).replace(os.linesep,''))
-
-
 class progress(Feature):
     """
     This class encapsulates progress feature.
     """
+    __slots__ = ('progress_triggers',)
+    literal_params = (('progress_trigger', 'progress_triggers'),)
+
     def __init__(self):
         super(progress, self).__init__()
         self.id = 'progress'
@@ -2215,7 +2404,7 @@ class progress(Feature):
         """
         if 'progress_trigger' in conf_map:
             self.active.setChecked(True)
-            self.progress_triggers.setText(str(conf_map['progress_trigger']).replace(" ", ""))
+            self.progress_triggers.setText(compact(conf_map['progress_trigger']))
         else:
             self.active.setChecked(False)
             return
@@ -2249,46 +2438,33 @@ class progress(Feature):
         self.progress_triggers.setText('[0,20]')
 
 
-    def add_feat_conf(self, conf_map):
-        """
-        This function adds progress feature's parameters to dictionary.
-        Parameters
-        ----------
-        conf_map : dict
-            contains parameters for reconstruction
-        Returns
-        -------
-        nothing
-        """
-        conf_map['progress_trigger'] = ast.literal_eval(str(self.progress_triggers.text()).replace(os.linesep,''))
-
-
 class Features(QWidget):
     """
     This class is composition of all feature classes.
     """
     def __init__(self, tab, layout):
         """
-        Constructor, creates all concrete feature objects, and displays in window.
+        Constructor, lists all features, and displays in window. The concrete feature objects are created when
+        the feature is displayed or configured, see get_feature.
         """
         super(Features, self).__init__()
-        feature_ids = ['GA', 'low resolution', 'shrink wrap', 'phase constrain', 'pcdi', 'twin', 'average', 'progress']
+        self.feature_classes = {'GA' : GA,
+                                'low resolution' : low_resolution,
+                                'shrink wrap' : shrink_wrap,
+                                'phase constrain' : phase_constrain,
+                                'pcdi' : pcdi,
+                                'twin' : twin,
+                                'average' : average,
+                                'progress' : progress}
+        # features created so far
+        self.feature_dir = {}
         self.leftlist = QListWidget()
-        self.feature_dir = {'GA' : GA(),
-                            'low resolution' : low_resolution(),
-                            'shrink wrap' : shrink_wrap(),
-                            'phase constrain' : phase_constrain(),
-                            'pcdi' : pcdi(),
-                            'twin' : twin(),
-                            'average' : average(),
-                            'progress' : progress()}
         self.Stack = QStackedWidget(self)
-        for i in range(len(feature_ids)):
-            id = feature_ids[i]
+        for i, id in enumerate(self.feature_classes):
             self.leftlist.insertItem(i, id)
-            feature = self.feature_dir[id]
-            feature.stackUI(self.leftlist.item(i), self)
-            self.Stack.addWidget(feature.stack)
+            # not created feature is not active
+            self.leftlist.item(i).setForeground(QColor('grey'))
+            self.Stack.addWidget(QWidget())
 
         layout.addWidget(self.leftlist)
         layout.addWidget(self.Stack)
@@ -2296,11 +2472,47 @@ class Features(QWidget):
         self.leftlist.currentRowChanged.connect(self.display)
 
 
+    def get_feature(self, i):
+        """
+        Returns feature at the given row, creates it, and replaces its placeholder in the stack if needed.
+        """
+        id = self.leftlist.item(i).text()
+        if id not in self.feature_dir:
+            feature = self.feature_classes[id]()
+            feature.stackUI(self.leftlist.item(i), self)
+            placeholder = self.Stack.widget(i)
+            was_current = self.Stack.currentWidget() is placeholder
+            self.Stack.insertWidget(i, feature.stack)
+            self.Stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            if was_current:
+                self.Stack.setCurrentIndex(i)
+            self.feature_dir[id] = feature
+        return self.feature_dir[id]
+
+
+    def init_config(self, conf_map):
+        # the fields are set with updates disabled, so the features are repainted once, not after every field
+        self.setUpdatesEnabled(False)
+        try:
+            # the first literal parameter activates feature, features not created and not configured stay inactive
+            for i, (id, feature_class) in enumerate(self.feature_classes.items()):
+                if id in self.feature_dir or feature_class.literal_params[0][0] in conf_map:
+                    self.get_feature(i).init_config(conf_map)
+        finally:
+            self.setUpdatesEnabled(True)
+
+
     def display(self, i):
+        self.get_feature(i)
         self.Stack.setCurrentIndex(i)
 
 
 class MpTab(QWidget):
+    # parameters parsed from text fields, the widget has the parameter name; scan is kept as text
+    literal_params = ('orientations', 'hkl_in', 'hkl_out', 'twin_plane', 'sample_axis', 'final_size', 'mp_max_weight',
+                      'mp_taper', 'lattice_size', 'ds_voxel_size', 'switch_peak_trigger')
+
     def __init__(self, parent=None):
         """
         Constructor, initializes the tabs.
@@ -2369,17 +2581,8 @@ class MpTab(QWidget):
 
     def clear_conf(self):
         self.scan.setText('')
-        self.orientations.setText('')
-        self.hkl_in.setText('')
-        self.hkl_out.setText('')
-        self.twin_plane.setText('')
-        self.sample_axis.setText('')
-        self.final_size.setText('')
-        self.mp_max_weight.setText('')
-        self.mp_taper.setText('')
-        self.lattice_size.setText('')
-        self.ds_voxel_size.setText('')
-        self.switch_peak_trigger.setText('')
+        for param in self.literal_params:
+            getattr(self, param).setText('')
 
 
     def load_tab(self, conf_map):
@@ -2394,29 +2597,10 @@ class MpTab(QWidget):
         nothing
         """
         if 'scan' in conf_map:
-            self.scan.setText(str(conf_map['scan']).replace(" ", ""))
-        if 'orientations' in conf_map:
-            self.orientations.setText(str(conf_map['orientations']))
-        if 'hkl_in' in conf_map:
-            self.hkl_in.setText(str(conf_map['hkl_in']))
-        if 'hkl_out' in conf_map:
-            self.hkl_out.setText(str(conf_map['hkl_out']))
-        if 'twin_plane' in conf_map:
-            self.twin_plane.setText(str(conf_map['twin_plane']))
-        if 'sample_axis' in conf_map:
-            self.sample_axis.setText(str(conf_map['sample_axis']))
-        if 'final_size' in conf_map:
-            self.final_size.setText(str(conf_map['final_size']))
-        if 'mp_max_weight' in conf_map:
-            self.mp_max_weight.setText(str(conf_map['mp_max_weight']))
-        if 'mp_taper' in conf_map:
-            self.mp_taper.setText(str(conf_map['mp_taper']))
-        if 'lattice_size' in conf_map:
-            self.lattice_size.setText(str(conf_map['lattice_size']))
-        if 'ds_voxel_size' in conf_map:
-            self.ds_voxel_size.setText(str(conf_map['ds_voxel_size']))
-        if 'switch_peak_trigger' in conf_map:
-            self.switch_peak_trigger.setText(str(conf_map['switch_peak_trigger']))
+            self.scan.setText(compact(conf_map['scan']))
+        for param in self.literal_params:
+            if param in conf_map:
+                getattr(self, param).setText(str(conf_map[param]))
 
 
     def save_conf(self):
@@ -2432,32 +2616,15 @@ class MpTab(QWidget):
         """
         conf_map = {}
 
-        if len(self.scan.text()) > 0:
-            conf_map['scan'] = str(self.scan.text())
-        if len(self.orientations.text()) > 0:
-            conf_map['orientations'] = ast.literal_eval(str(self.orientations.text()))
-        if len(self.hkl_in.text()) > 0:
-            conf_map['hkl_in'] = ast.literal_eval(str(self.hkl_in.text()))
-        if len(self.hkl_out.text()) > 0:
-            conf_map['hkl_out'] = ast.literal_eval(str(self.hkl_out.text()))
-        if len(self.twin_plane.text()) > 0:
-            conf_map['twin_plane'] = ast.literal_eval(str(self.twin_plane.text()))
-        if len(self.sample_axis.text()) > 0:
-            conf_map['sample_axis'] = ast.literal_eval(str(self.sample_axis.text()))
-        if len(self.final_size.text()) > 0:
-            conf_map['final_size'] = ast.literal_eval(str(self.final_size.text()))
-        if len(self.mp_max_weight.text()) > 0:
-            conf_map['mp_max_weight'] = ast.literal_eval(str(self.mp_max_weight.text()))
-        if len(self.mp_taper.text()) > 0:
-            conf_map['mp_taper'] = ast.literal_eval(str(self.mp_taper.text()))
-        if len(self.lattice_size.text()) > 0:
-            conf_map['lattice_size'] = ast.literal_eval(str(self.lattice_size.text()))
-        if len(self.ds_voxel_size.text()) > 0:
-            conf_map['ds_voxel_size'] = ast.literal_eval(str(self.ds_voxel_size.text()))
-        if len(self.switch_peak_trigger.text()) > 0:
-            conf_map['switch_peak_trigger'] = ast.literal_eval(str(self.switch_peak_trigger.text()))
-
-        ut.write_config(conf_map, self.main_win.experiment_dir + '/conf/config_mp')
+        scan = self.scan.text()
+        if len(scan) > 0:
+            conf_map['scan'] = scan
+        for param in self.literal_params:
+            text = getattr(self, param).text()
+            if text:
+                conf_map[param] = com.parse_literal(text)
+
+        write_config(conf_map, ut.join(self.main_win.experiment_dir, 'conf', 'config_mp'))
 
 
     def load_mp_conf(self):
@@ -2472,16 +2639,34 @@ class MpTab(QWidget):
         """
         conf_file = select_file(os.getcwd())
         if conf_file is not None:
-            conf_map = ut.read_config(conf_file.replace(os.sep, '/'))
+            conf_map = read_config(conf_file)
             self.load_tab(conf_map)
         else:
             msg_window('please select valid config file')
 
 
+def preload_modules():
+    """
+    Imports processing scripts run from the tabs and beam_tabs modules of all beamlines, so the imports are done
+    when the experiment is set or the processing is run.
+    """
+    import beamlines
+
+    modules = ['standard_preprocess', 'run_reconstruction', 'beamline_preprocess', 'beamline_visualization']
+    modules.extend(f'beamlines.{module_info.name}.beam_tabs' for module_info in pkgutil.iter_modules(beamlines.__path__))
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            # the error is reported when the module is used
+            pass
+
+
 def main():
     """
     Starts GUI application.
     """
+    threading.Thread(target=preload_modules, daemon=True).start()
     parser = argparse.ArgumentParser()
     parser.add_argument("--no_verify", action="store_true",
                         help="if True the verifier has no effect on processing")
@@ -1,8 +1,15 @@
 import sys
 import os
+import ast
+import re
 import convertconfig as conv
 import cohere_core.utilities as ut
 
+# path separators need to be replaced only on systems where the separator is not '/'
+NEEDS_SEP_FIX = os.sep != '/'
+# integer or float number, as typed in numeric fields; an integer with leading zero is not a python literal
+NUMBER_RE = re.compile(r'-?(0|[1-9][0-9]*)(\.[0-9]*)?([eE][-+]?[0-9]+)?')
+
 
 def get_config_maps(experiment_dir, configs, config_id=None):
     """
@@ -32,7 +39,8 @@ def get_config_maps(experiment_dir, configs, config_id=None):
     converted = False
     main_config_map = ut.read_config(main_conf)
     # convert configuration files if different converter version
-    if 'converter_ver' not in main_config_map or conv.get_version() is None or conv.get_version() > main_config_map['converter_ver']:
+    conv_version = conv.get_version()
+    if 'converter_ver' not in main_config_map or conv_version is None or conv_version > main_config_map['converter_ver']:
         conv.convert(conf_dir)
         main_config_map = ut.read_config(main_conf)
         converted = True
@@ -56,6 +64,54 @@ def get_config_maps(experiment_dir, configs, config_id=None):
     return maps, converted
 
 
+def norm_path(path):
+    """
+    Returns path with '/' separators. The path is not scanned on systems where '/' is the separator.
+    """
+    if NEEDS_SEP_FIX:
+        return path.replace(os.sep, '/')
+    return path
+
+
+def parse_number(text):
+    """
+    Parses number matched by NUMBER_RE.
+
+    :param text: str
+        text to parse
+    :return:
+        int or float
+    """
+    return int(text) if text.lstrip('-').isdigit() else float(text)
+
+
+def parse_literal(text):
+    """
+    Parses literal typed in a field. Numbers and flat lists of numbers, the common case, are parsed directly,
+    other literals are evaluated with ast.literal_eval. The result, or the error, is the same as from
+    ast.literal_eval.
+
+    :param text: str
+        text to parse
+    :return:
+        parsed value
+    """
+    text = text.strip()
+    if NUMBER_RE.fullmatch(text):
+        return parse_number(text)
+    if text[:1] == '[' and text[-1:] == ']':
+        items = [item.strip() for item in text[1:-1].split(',')]
+        if items == ['']:
+            return []
+        # python allows a comma after the last item
+        if len(items[-1]) == 0:
+            items.pop()
+        # any other literal, or an empty item, is left to ast.literal_eval
+        if all(NUMBER_RE.fullmatch(item) for item in items):
+            return [parse_number(item) for item in items]
+    return ast.literal_eval(text)
+
+
 def get_pkg(proc, dev):
     pkg = 'np'
     err_msg = ''
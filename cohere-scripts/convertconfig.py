@@ -62,20 +62,12 @@ move_dict = {'config':{'config_instr':['specfile']},
 def get_version():
     """
     Returns current version of this script. The version is an integer number and it must be updated after
-    each modification of the script.
+    each modification of the script. The version is a module constant, so the call is cheap.
 
-    Parameters
-    ----------
-    data : ndarray
-        an array with experiment data
-    config : Object
-        configuration object providing access to configuration parameters
-    data_dir : str
-        a directory where 'alien_analysis' subdirectory will be created to save results of analysis if configured
     Returns
     -------
-    data : ndarray
-        data array without aliens
+    int
+        converter version
     """
     return version
 
@@ -17,6 +17,7 @@ __all__ = ['create_conf_prep',
            'create_conf_data',
            'create_conf_rec',
            'create_conf_disp',
+           'create_conf_instr',
            'create_exp',
            'main']
 
@@ -25,6 +26,78 @@ import os
 import cohere_core.utilities as ut
 import convertconfig as conv
 
+# initial configuration files, written as is
+PREP_TEMPLATE = """\
+data_dir = "/path/to/raw/data"
+darkfield_filename = "/path/to/darkfield_file/dark.tif"
+whitefield_filename = "/path/to/whitefield_file/dark.tif"
+// roi = [0,256,0,256]
+// min_files = 80
+// exclude_scans = [78,81]
+// Imult = 10000
+"""
+
+DATA_TEMPLATE = """\
+// data_dir = "/path/to/dir/formatted_data/is/saved"
+alien_alg = "none"
+// aliens = [[170,220,112,195,245,123], [50,96,10,60,110,20]]
+// aliens = "/path/to/maskfile/maskfile"
+intensity_threshold = 20.0
+// adjust_dimensions = [-13, -13, -65, -65, -65, -65]
+// center_shift = [0,0,0]
+// binning = [1,1,1]
+"""
+
+REC_TEMPLATE = """\
+// data_dir = "/path/to/dir/with/formatted_data"
+// save_dir = "/path/to/dir/to/save/results"
+// init_guess = "random"
+// processing = "auto"
+reconstructions = 1
+device = [0,1]
+algorithm_sequence = "3* (20*ER + 180*HIO) + 20*ER"
+hio_beta = .9
+// ga_generations = 1
+// ga_metrics = ["chi", "sharpness"]
+// ga_breed_modes = ["sqrt_ab"]
+// ga_cullings = [2,1]
+// ga_sw_thresholds = [.15, .1]
+// ga_sw_gauss_sigmas = [1.1, 1.0]
+// ga_lpf_sigmas = [2.0, 1.5]
+// ga_gen_pc_start = 3
+twin_trigger = [2]
+// twin_halves = [0, 0]
+shrink_wrap_trigger = [10, 1]
+shrink_wrap_type = "GAUSS"
+shrink_wrap_threshold = 0.1
+shrink_wrap_gauss_sigma = 1.0
+initial_support_area = [.5,.5,.5]
+
+// phm_trigger = [0, 1, 320]
+// phm_phase_min = -1.57
+// phm_phase_max = 1.57
+// pc_interval = 50
+// pc_type = "LUCY"
+// pc_LUCY_iterations = 20
+// pc_normalize = True
+// pc_LUCY_kernel = [16,16,16]
+// lowpass_filter_trigger = [0, 1, 320]
+// lowpass_filter_sw_threshold = .1
+// lowpass_filter_range = [.7]
+// average_trigger = [-60, 1]
+progress_trigger = [0, 20]"""
+
+DISP_TEMPLATE = """\
+// results_dir = "/path/to/dir/with/reconstructed/image(s)"
+// rampups = 1
+crop = [.5, .5, .5]
+"""
+
+INSTR_TEMPLATE = """\
+diffractometer = "34idc"
+// scanfile = "path/to/scanfile/scanfile"
+"""
+
 
 def create_conf_prep(conf_dir):
     """
@@ -39,18 +112,9 @@ def create_conf_prep(conf_dir):
     -------
     nothing
     """
-    conf_dir = conf_dir.replace(os.sep, '/')
-    conf_file_name = conf_dir + '/config_prep'
-    f = open(conf_file_name, "w+")
-
-    f.write('data_dir = "/path/to/raw/data"\n')
-    f.write('darkfield_filename = "/path/to/darkfield_file/dark.tif"\n')
-    f.write('whitefield_filename = "/path/to/whitefield_file/dark.tif"\n')
-    f.write('// roi = [0,256,0,256]\n')
-    f.write('// min_files = 80\n')
-    f.write('// exclude_scans = [78,81]\n')
-    f.write('// Imult = 10000\n')
-    f.close()
+    conf_file_name = ut.join(conf_dir, 'config_prep')
+    with open(conf_file_name, 'w+') as f:
+        f.write(PREP_TEMPLATE)
 
 
 def create_conf_data(conf_dir):
@@ -66,19 +130,9 @@ def create_conf_data(conf_dir):
     -------
     nothing
     """
-    conf_dir = conf_dir.replace(os.sep, '/')
-    conf_file_name = conf_dir + '/config_data'
-    f = open(conf_file_name, "w+")
-
-    f.write('// data_dir = "/path/to/dir/formatted_data/is/saved"\n')
-    f.write('alien_alg = "none"\n')
-    f.write('// aliens = [[170,220,112,195,245,123], [50,96,10,60,110,20]]\n')
-    f.write('// aliens = "/path/to/maskfile/maskfile"\n')
-    f.write('intensity_threshold = 20.0\n')
-    f.write('// adjust_dimensions = [-13, -13, -65, -65, -65, -65]\n')
-    f.write('// center_shift = [0,0,0]\n')
-    f.write('// binning = [1,1,1]\n')
-    f.close()
+    conf_file_name = ut.join(conf_dir, 'config_data')
+    with open(conf_file_name, 'w+') as f:
+        f.write(DATA_TEMPLATE)
 
 
 def create_conf_rec(conf_dir):
@@ -94,47 +148,9 @@ def create_conf_rec(conf_dir):
     -------
     nothing
     """
-    conf_dir = conf_dir.replace(os.sep, '/')
-    conf_file_name = conf_dir + '/config_rec'
-    f = open(conf_file_name, "w+")
-
-    f.write('// data_dir = "/path/to/dir/with/formatted_data"\n')
-    f.write('// save_dir = "/path/to/dir/to/save/results"\n')
-    f.write('// init_guess = "random"\n')
-    f.write('// processing = "auto"\n')
-    f.write('reconstructions = 1\n')
-    f.write('device = [0,1]\n')
-    f.write('algorithm_sequence = "3* (20*ER + 180*HIO) + 20*ER"\n')
-    f.write('hio_beta = .9\n')
-    f.write('// ga_generations = 1\n')
-    f.write('// ga_metrics = ["chi", "sharpness"]\n')
-    f.write('// ga_breed_modes = ["sqrt_ab"]\n')
-    f.write('// ga_cullings = [2,1]\n')
-    f.write('// ga_sw_thresholds = [.15, .1]\n')
-    f.write('// ga_sw_gauss_sigmas = [1.1, 1.0]\n')
-    f.write('// ga_lpf_sigmas = [2.0, 1.5]\n')
-    f.write('// ga_gen_pc_start = 3\n')
-    f.write('twin_trigger = [2]\n')
-    f.write('// twin_halves = [0, 0]\n')
-    f.write('shrink_wrap_trigger = [10, 1]\n')
-    f.write('shrink_wrap_type = "GAUSS"\n')
-    f.write('shrink_wrap_threshold = 0.1\n')
-    f.write('shrink_wrap_gauss_sigma = 1.0\n')
-    f.write('initial_support_area = [.5,.5,.5]\n\n')
-    f.write('// phm_trigger = [0, 1, 320]\n')
-    f.write('// phm_phase_min = -1.57\n')
-    f.write('// phm_phase_max = 1.57\n')
-    f.write('// pc_interval = 50\n')
-    f.write('// pc_type = "LUCY"\n')
-    f.write('// pc_LUCY_iterations = 20\n')
-    f.write('// pc_normalize = True\n')
-    f.write('// pc_LUCY_kernel = [16,16,16]\n')
-    f.write('// lowpass_filter_trigger = [0, 1, 320]\n')
-    f.write('// lowpass_filter_sw_threshold = .1\n')
-    f.write('// lowpass_filter_range = [.7]\n')
-    f.write('// average_trigger = [-60, 1]\n')
-    f.write('progress_trigger = [0, 20]')
-    f.close()
+    conf_file_name = ut.join(conf_dir, 'config_rec')
+    with open(conf_file_name, 'w+') as f:
+        f.write(REC_TEMPLATE)
 
 
 def create_conf_disp(conf_dir):
@@ -150,19 +166,14 @@ def create_conf_disp(conf_dir):
     -------
     nothing
     """
-    conf_dir = conf_dir.replace(os.sep, '/')
-    conf_file_name = conf_dir + '/config_disp'
-    f = open(conf_file_name, "w+")
-
-    f.write('// results_dir = "/path/to/dir/with/reconstructed/image(s)"\n')
-    f.write('// rampups = 1\n')
-    f.write('crop = [.5, .5, .5]\n')
-    f.close()
+    conf_file_name = ut.join(conf_dir, 'config_disp')
+    with open(conf_file_name, 'w+') as f:
+        f.write(DISP_TEMPLATE)
 
 
-def create_conf_disp(conf_dir):
+def create_conf_instr(conf_dir):
     """
-    Creates a "config_disp" file with some parameters commented out.
+    Creates a "config_instr" file with some parameters commented out.
 
     Parameters
     ----------
@@ -173,13 +184,9 @@ def create_conf_disp(conf_dir):
     -------
     nothing
     """
-    conf_dir = conf_dir.replace(os.sep, '/')
-    conf_file_name = conf_dir + '/config_instr'
-    f = open(conf_file_name, "w+")
-
-    f.write('diffractometer = "34idc"\n')
-    f.write('// scanfile = "path/to/scanfile/scanfile"\n')
-    f.close()
+    conf_file_name = ut.join(conf_dir, 'config_instr')
+    with open(conf_file_name, 'w+') as f:
+        f.write(INSTR_TEMPLATE)
 
 
 def create_exp(prefix, scan, working_dir, **args):
@@ -210,19 +217,19 @@ def create_exp(prefix, scan, working_dir, **args):
         print('working directory ' + working_dir + ' does not exist')
         return
 
-    experiment_dir = working_dir + '/' + id
+    experiment_dir = ut.join(working_dir, id)
     if not os.path.exists(experiment_dir):
         os.makedirs(experiment_dir)
     else:
         print('experiment with this id already exists')
         return experiment_dir
 
-    experiment_conf_dir = experiment_dir + '/conf'
+    experiment_conf_dir = ut.join(experiment_dir, 'conf')
     if not os.path.exists(experiment_conf_dir):
         os.makedirs(experiment_conf_dir)
 
     # Based on params passed to this function create a temp config file and then copy it to the experiment dir.
-    experiment_main_config = experiment_conf_dir + '/config'
+    experiment_main_config = ut.join(experiment_conf_dir, 'config')
     conf_map = {}
     conf_map['working_dir'] = working_dir
     conf_map['experiment_id'] = prefix
@@ -242,6 +249,7 @@ def create_exp(prefix, scan, working_dir, **args):
     create_conf_data(experiment_conf_dir)
     create_conf_rec(experiment_conf_dir)
     create_conf_disp(experiment_conf_dir)
+    create_conf_instr(experiment_conf_dir)
 
     return experiment_dir
 
@@ -230,7 +230,7 @@ def cull(lst, no_left):
         return lst[0:no_left]
 
 
-def reconstruction(pkg, conf_file, datafile, dir, devices):
+def reconstruction(pkg, conf_file, datafile, dir, devices, pars=None):
     """
     Controls reconstruction that employs genetic algorith (GA).
 
@@ -261,8 +261,12 @@ def reconstruction(pkg, conf_file, datafile, dir, devices):
     devices : list
         list of GPUs available for this reconstructions
 
+    pars : dict
+        optional, parameters already parsed from configuration file; the file is read if not given
+
     """
-    pars = ut.read_config(conf_file)
+    if pars is None:
+        pars = ut.read_config(conf_file)
     pars = gaut.set_ga_defaults(pars)
 
     if pars['ga_generations'] < 2:
@@ -13,6 +13,7 @@ __author__ = "Barbara Frosik"
 __copyright__ = "Copyright (c), UChicago Argonne, LLC."
 __docformat__ = 'restructuredtext en'
 __all__ = ['get_job_size',
+           'get_data_size',
            'split_resources',
            'process_scan_range',
            'manage_reconstruction',
@@ -21,6 +22,8 @@ __all__ = ['get_job_size',
 import os
 import sys
 import argparse
+import math
+import tifffile as tf
 from multiprocessing import Process, Queue
 import cohere_core.controller as rec
 import cohere_core.utilities as ut
@@ -48,6 +51,22 @@ def get_job_size(size, method, pc_in_use=False):
     return job_size
 
 
+def get_data_size(datafile):
+    """
+    Returns number of elements in data tif file. Only the file header is read, the data is not loaded.
+    Parameters
+    ----------
+    datafile : str
+        name of tif file containing data
+    Returns
+    -------
+    int
+        data size
+    """
+    with tf.TiffFile(datafile) as tif:
+        return math.prod(tif.series[0].shape)
+
+
 def split_resources(hostfile, devs, no_scans):
     # get available hosts and number of devices for use on then
     with open(hostfile) as f:
@@ -78,7 +97,7 @@ def split_resources(hostfile, devs, no_scans):
     return hostfiles
 
 
-def process_scan_range(ga_method, pkg, conf_file, datafile, dir, picked_devs, hostfile, q=None):
+def process_scan_range(ga_method, pkg, conf_file, datafile, dir, picked_devs, hostfile, q=None, pars=None, scan_process=False):
     """
     Calls the reconstruction function in a module identified by parameter. After the reconstruction is finished, it enqueues th eprocess id wit associated list of gpus.
     Parameters
@@ -100,19 +119,40 @@ def process_scan_range(ga_method, pkg, conf_file, datafile, dir, picked_devs, ho
     q : Queue
        a queue that returns tuple of procees id and associated gpu list after the reconstruction process is done;
        is used in multiple scans scenario
+    pars : dict
+       optional, parameters parsed from conf_file, passed to reconstructions that run in this process
+    scan_process : bool
+       True if the scan runs in its own process, started for multiple scans
     Returns
     -------
     nothing
     """
-    if len(picked_devs) == 1:
-        rec.reconstruction_single.reconstruction(pkg, conf_file, datafile, dir, picked_devs)
-    elif ga_method is None or ga_method == 'ga_fast':
-        mpi_cmd.run_with_mpi(ga_method, pkg, conf_file, datafile, dir, picked_devs, hostfile)
-    else:
-        reconstruction_populous_GA.reconstruction(pkg, conf_file, datafile, dir, picked_devs)
-
-    if q is not None:
-        q.put((os.getpid(), picked_devs, hostfile))
+    run_devs = picked_devs
+    # a scan running in its own process on local gpus sees only the gpus assigned to it, so the libraries
+    # do not create context on other devices; the devices are then numbered from 0 in this process
+    if scan_process and hostfile is None and picked_devs[0] != -1:
+        # a gpu may be picked for several jobs, it is listed once, and the jobs refer to its index in the list
+        scan_devs = list(dict.fromkeys(picked_devs))
+        # the picked devices index the gpus visible to this process, a scheduler may have already restricted them
+        inherited = os.environ.get('CUDA_VISIBLE_DEVICES', '').strip()
+        if len(inherited) > 0:
+            visible = [dev.strip() for dev in inherited.split(',')]
+            os.environ['CUDA_VISIBLE_DEVICES'] = ','.join(visible[dev] for dev in scan_devs)
+        else:
+            os.environ['CUDA_VISIBLE_DEVICES'] = ','.join(str(dev) for dev in scan_devs)
+        run_devs = [scan_devs.index(dev) for dev in picked_devs]
+
+    try:
+        if len(run_devs) == 1:
+            rec.reconstruction_single.reconstruction(pkg, conf_file, datafile, dir, run_devs)
+        elif ga_method is None or ga_method == 'ga_fast':
+            mpi_cmd.run_with_mpi(ga_method, pkg, conf_file, datafile, dir, run_devs, hostfile)
+        else:
+            reconstruction_populous_GA.reconstruction(pkg, conf_file, datafile, dir, run_devs, pars)
+    finally:
+        # the devices are returned also when reconstruction failed, otherwise the waiting scans would hang
+        if q is not None:
+            q.put((os.getpid(), picked_devs, hostfile))
 
 
 def manage_reconstruction(experiment_dir, config_id, no_verify):
@@ -225,7 +265,7 @@ def manage_reconstruction(experiment_dir, config_id, no_verify):
     else:
         # based on configured devices find what is available
         # this code below assigns jobs for GPUs
-        data_size = ut.read_tif(exp_dirs_data[0][0]).size
+        data_size = get_data_size(exp_dirs_data[0][0])
         job_size = get_job_size(data_size, ga_method, 'pc' in rec_config_map['algorithm_sequence'])
         picked_devs, avail_jobs, hostfile = ut.get_gpu_use(devices, want_dev_no, job_size)
 
@@ -234,7 +274,7 @@ def manage_reconstruction(experiment_dir, config_id, no_verify):
 
     if no_scan_ranges == 1:
             datafile, dir = exp_dirs_data[0]
-            process_scan_range(ga_method, pkg, conf_file, datafile, dir, picked_devs, hostfile)
+            process_scan_range(ga_method, pkg, conf_file, datafile, dir, picked_devs, hostfile, pars=rec_config_map)
     else: # multiple scans or scan ranges
         q = None
         if avail_jobs >= want_dev_no:
@@ -258,7 +298,7 @@ def manage_reconstruction(experiment_dir, config_id, no_verify):
         for i in range(no_concurrent_scans):
             datafile, dir = exp_dirs_data[i]
             # run concurrently
-            p = Process(target=process_scan_range, args=(ga_method, pkg, conf_file, datafile, dir, scan_picked_devs[i], hostfiles[i], q))
+            p = Process(target=process_scan_range, args=(ga_method, pkg, conf_file, datafile, dir, scan_picked_devs[i], hostfiles[i], q, rec_config_map, True))
             p.start()
             pr[p.pid] = p
 
@@ -266,15 +306,22 @@ def manage_reconstruction(experiment_dir, config_id, no_verify):
         while i < no_scan_ranges:
             datafile, dir = exp_dirs_data[i]
             i += 1
-            pid, devs, hostfile = q.get()
-            if pid in pr.keys():
-               del pr[pid]
-            p = Process(target=process_scan_range, args=(ga_method, pkg, conf_file, datafile, dir, devs, hostfile, q))
+            # wait for a scan to finish, and reuse its devices and hostfile
+            pid, devs, scan_hostfile = q.get()
+            if pid in pr:
+                # the finished process is joined now, not when all scans are done
+                finished = pr.pop(pid)
+                finished.join()
+                if finished.exitcode != 0:
+                    print(f'reconstruction process {pid} failed with exit code {finished.exitcode}')
+            p = Process(target=process_scan_range, args=(ga_method, pkg, conf_file, datafile, dir, devs, scan_hostfile, q, rec_config_map, True))
             p.start()
             pr[p.pid] = p
 
         for p in pr.values():
             p.join()
+            if p.exitcode != 0:
+                print(f'reconstruction process {p.pid} failed with exit code {p.exitcode}')
 
         if q is not None:
             while not q.empty():
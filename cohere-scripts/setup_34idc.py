@@ -140,13 +140,14 @@ def setup_rundirs(prefix, scan, conf_dir, **kwargs):
         # get case of single scan or summed
         prep_dir_list = glob.glob(ut.join(other_exp_dir, 'preprocessed_data'), recursive=True)
         for dir in prep_dir_list:
-            shutil.copytree(dir.replace(os.sep, '/'), ut.join(new_exp_dir, 'preprocessed_data'))
+            shutil.copytree(dir, ut.join(new_exp_dir, 'preprocessed_data'))
 
             # get case of split scans
-        prep_dir_list = glob.glob(other_exp_dir  = '/scan*/preprocessed_data', recursive=True)
+        prep_dir_list = glob.glob(ut.join(other_exp_dir, 'scan*', 'preprocessed_data'), recursive=True)
         for dir in prep_dir_list:
-            scandir = os.path.basename(os.path.split(dir.replace(os.sep, '/'))[0]).replace(os.sep, '/')
-            shutil.copytree(dir.replace(os.sep, '/'), ut.join(new_exp_dir, scandir, 'preprocessed_data'))
+            # the scan directory name has no separators
+            scandir = os.path.basename(os.path.dirname(dir))
+            shutil.copytree(dir, ut.join(new_exp_dir, scandir, 'preprocessed_data'))
     return experiment_dir
         #################################################################################
 
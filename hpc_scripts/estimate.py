@@ -10,7 +10,9 @@ data_file = sys.argv[2]
 no_recs = int(sys.argv[3])
 is_ga =  int(sys.argv[4])
 
-data_shape = tf.imread(data_file).shape
+# only the shape is needed, read it from the file header without loading data
+with tf.TiffFile(data_file) as tif:
+    data_shape = tif.series[0].shape
 data_size = reduce((lambda x, y: x * y), data_shape) / 1000000.
 
 if no_recs > 1: